@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+INDEX_NAME = 'companies_entity_metadata_gin'
+
+
+def create_metadata_gin_index(apps, schema_editor):
+    """Índice GIN sobre metadata (JSONB); solo existe en PostgreSQL."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON companies_entity USING gin (metadata)'
+    )
+
+
+def drop_metadata_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_metadata_gin_index, drop_metadata_gin_index),
+    ]
@@ -40,7 +40,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
     def users(self, request, pk=None):
         """Obtiene los usuarios de una empresa."""
         company = self.get_object()
-        users = User.objects.filter(company=company, is_active=True)
+        users = User.objects.filter(company=company, is_active=True).select_related('company')
         serializer = UserSerializer(users, many=True)
         return Response(serializer.data)
     
@@ -48,7 +48,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
     def entities(self, request, pk=None):
         """Obtiene las entidades de una empresa."""
         company = self.get_object()
-        entities = Entity.objects.filter(company=company, is_active=True)
+        entities = Entity.objects.filter(company=company, is_active=True).select_related('entity_type')
         serializer = EntitySerializer(entities, many=True)
         return Response(serializer.data)
     
@@ -249,8 +249,8 @@ class ValidationFlow(models.Model):
         return f"Flujo de validación para {self.document.name}"
     
     def get_steps(self):
-        """Retorna los pasos del flujo ordenados por orden."""
-        return self.steps.all().order_by('order')
+        """Retorna los pasos del flujo ordenados por orden (con su aprobador)."""
+        return self.steps.select_related('approver').order_by('order')
     
     def get_pending_steps(self):
         """Retorna los pasos pendientes de aprobación."""
@@ -289,16 +289,18 @@ class ValidationFlow(models.Model):
         if not self.is_active:
             return False
         
-        max_order = self.get_max_order()
-        if max_order == 0:
+        # steps.all() reutiliza los pasos precargados con prefetch_related,
+        # así que serializar un listado no consulta cada flujo por separado
+        steps = list(self.steps.all())
+        if not steps:
             return False
         
         # Verificar si el paso de mayor orden está aprobado
-        return self.steps.filter(order=max_order, status='A').exists()
+        return max(steps, key=lambda step: step.order).status == 'A'
     
     def is_rejected(self):
         """Indica si el flujo fue rechazado."""
-        return self.steps.filter(status='R').exists()
+        return any(step.status == 'R' for step in self.steps.all())
 
 
 class ValidationStep(models.Model):
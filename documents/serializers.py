@@ -15,6 +15,29 @@ from companies.models import Company, Entity, EntityType, User
 User = get_user_model()
 
 
+def _cached_count(serializer, obj, method_name):
+    """
+    Calcula un conteo del modelo una sola vez por objeto y serialización.
+
+    Los serializers anidados comparten el contexto del serializer raíz, así
+    que al listar documentos de la misma empresa, entidad o usuario el conteo
+    se consulta una vez y no por cada documento.
+
+    Args:
+        serializer: Serializer que solicita el conteo
+        obj: Instancia del modelo
+        method_name: Nombre del método del modelo que calcula el conteo
+
+    Returns:
+        Resultado del método del modelo
+    """
+    cache = serializer.context.setdefault('_counts', {})
+    key = (obj._meta.label, obj.pk, method_name)
+    if key not in cache:
+        cache[key] = getattr(obj, method_name)()
+    return cache[key]
+
+
 class CompanySerializer(serializers.ModelSerializer):
     """Serializer para el modelo Company."""
     
@@ -31,11 +54,11 @@ class CompanySerializer(serializers.ModelSerializer):
     
     def get_users_count(self, obj):
         """Retorna el número de usuarios activos de la empresa."""
-        return obj.get_active_users_count()
+        return _cached_count(self, obj, 'get_active_users_count')
     
     def get_documents_count(self, obj):
         """Retorna el número de documentos de la empresa."""
-        return obj.get_documents_count()
+        return _cached_count(self, obj, 'get_documents_count')
 
 
 class EntityTypeSerializer(serializers.ModelSerializer):
@@ -66,11 +89,11 @@ class EntitySerializer(serializers.ModelSerializer):
     
     def get_documents_count(self, obj):
         """Retorna el número de documentos asociados a la entidad."""
-        return obj.get_documents_count()
+        return _cached_count(self, obj, 'get_documents_count')
     
     def get_pending_documents_count(self, obj):
         """Retorna el número de documentos pendientes de aprobación."""
-        return obj.get_pending_documents_count()
+        return _cached_count(self, obj, 'get_pending_documents_count')
     
     def validate_entity_type_id(self, value):
         """Valida que el tipo de entidad existe y está activo."""
@@ -108,7 +131,7 @@ class UserSerializer(serializers.ModelSerializer):
     
     def get_approval_actions_count(self, obj):
         """Retorna el número de acciones de aprobación realizadas por el usuario."""
-        return obj.get_approval_actions_count()
+        return _cached_count(self, obj, 'get_approval_actions_count')
     
     def create(self, validated_data):
         """Crea un nuevo usuario con contraseña encriptada."""
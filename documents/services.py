@@ -8,7 +8,7 @@ incluyendo la generación de URLs pre-firmadas para subida y descarga de archivo
 import os
 import uuid
 import hashlib
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union, BinaryIO
 from django.conf import settings
 from django.core.exceptions import ValidationError
 import boto3
@@ -79,17 +79,22 @@ class CloudStorageService:
         if size_bytes == 0:
             raise ValidationError("El archivo no puede estar vacío")
     
-    def calculate_file_hash(self, file_data: bytes) -> str:
+    def calculate_file_hash(self, file_data: Union[bytes, BinaryIO]) -> str:
         """
         Calcula el hash SHA-256 de un archivo.
         
+        Los archivos abiertos se leen por bloques con hashlib.file_digest, sin
+        cargar el contenido completo en memoria.
+        
         Args:
-            file_data: Datos del archivo
+            file_data: Datos del archivo o archivo binario abierto
             
         Returns:
             Hash SHA-256 del archivo
         """
-        return hashlib.sha256(file_data).hexdigest()
+        if isinstance(file_data, (bytes, bytearray, memoryview)):
+            return hashlib.sha256(file_data).hexdigest()
+        return hashlib.file_digest(file_data, 'sha256').hexdigest()
 
 
 class S3StorageService(CloudStorageService):
@@ -29,10 +29,11 @@ class MockCloudStorageService:
         self.max_file_size = getattr(settings, 'MAX_FILE_SIZE', 10485760)  # 10MB
         allowed_mime_types_str = getattr(settings, 'ALLOWED_MIME_TYPES', 
             'application/pdf,image/jpeg,image/png,image/gif,application/msword,application/vnd.openxmlformats-officedocument.wordprocessingml.document')
-        self.allowed_mime_types = allowed_mime_types_str.split(',') if isinstance(allowed_mime_types_str, str) else allowed_mime_types_str
+        # Conjunto inmutable: validate_file comprueba la pertenencia en O(1)
+        self.allowed_mime_types = frozenset(allowed_mime_types_str.split(',') if isinstance(allowed_mime_types_str, str) else allowed_mime_types_str)
         
         # Simular almacenamiento en memoria
-        self._storage = {}
+        self._storage: Dict[str, Dict[str, Any]] = {}
         logger.info("Servicio mock de cloud storage inicializado")
     
     def validate_file(self, mime_type: str, size_bytes: int) -> None:
@@ -0,0 +1,130 @@
+"""
+Tareas en segundo plano para el sistema ERP de gestión de documentos.
+
+Este módulo contiene los procesos por lotes (recordatorios, mantenimiento)
+que no deben ejecutarse dentro del ciclo de una petición HTTP. Si Celery
+está instalado las tareas se registran con `shared_task`; en caso contrario
+pueden invocarse directamente desde un comando o un cron.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable
+from django.core.mail import send_mail
+import logging
+
+from .models import ValidationStep
+from companies.models import Company, User
+
+try:
+    from celery import shared_task
+except ImportError:  # Celery es opcional
+    def shared_task(func):
+        return func
+
+logger = logging.getLogger(__name__)
+
+
+class MemoizedPrefetch:
+    """
+    Caché LRU de objetos relacionados compartida entre bloques de una iteración.
+
+    Al recorrer un queryset por bloques, los mismos aprobadores y empresas
+    aparecen una y otra vez. Esta caché solo consulta la base de datos por
+    los IDs que aún no ha visto, reutilizando el resto entre bloques.
+    """
+
+    def __init__(self, model, maxsize: int = 1024):
+        self.model = model
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+
+    def prefetch(self, ids: Iterable) -> Dict:
+        """
+        Retorna los objetos de los IDs indicados, consultando solo los faltantes.
+
+        Args:
+            ids: IDs de los objetos requeridos por el bloque actual
+
+        Returns:
+            Diccionario {id: objeto} con todos los IDs encontrados
+        """
+        wanted = set(ids)
+        found = {}
+        for pk in wanted:
+            if pk in self._cache:
+                self._cache.move_to_end(pk)
+                found[pk] = self._cache[pk]
+
+        missing = wanted - found.keys()
+        if missing:
+            fetched = self.model.objects.in_bulk(missing)
+            found.update(fetched)
+            for pk, obj in fetched.items():
+                self._cache[pk] = obj
+
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+        return found
+
+
+@shared_task
+def send_pending_approval_reminders(chunk_size: int = 1000) -> int:
+    """
+    Envía a cada aprobador un recordatorio con sus documentos pendientes.
+
+    Los pasos pendientes se recorren por bloques usando paginación por clave
+    primaria; aprobadores y empresas se resuelven mediante `MemoizedPrefetch`
+    para no repetir consultas entre bloques.
+
+    Args:
+        chunk_size: Número de pasos procesados por bloque
+
+    Returns:
+        Número de recordatorios enviados
+    """
+    approvers = MemoizedPrefetch(User)
+    companies = MemoizedPrefetch(Company)
+    pending = {}
+
+    steps = ValidationStep.objects.filter(
+        status='P',
+        validation_flow__is_active=True,
+        validation_flow__document__validation_status='P'
+    ).select_related('validation_flow__document').order_by('pk')
+
+    last_pk = None
+    while True:
+        chunk_qs = steps if last_pk is None else steps.filter(pk__gt=last_pk)
+        chunk = list(chunk_qs[:chunk_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+
+        users = approvers.prefetch(step.approver_id for step in chunk)
+        company_map = companies.prefetch(
+            step.validation_flow.document.company_id for step in chunk
+        )
+
+        for step in chunk:
+            document = step.validation_flow.document
+            approver = users[step.approver_id]
+            company = company_map[document.company_id]
+            pending.setdefault(approver.id, (approver, []))[1].append(
+                f"- {document.name} ({company.name})"
+            )
+
+    sent = 0
+    for approver, lines in pending.values():
+        if not approver.email:
+            continue
+        send_mail(
+            subject=f"Tienes {len(lines)} documento(s) pendiente(s) de aprobación",
+            message="\n".join(lines),
+            from_email=None,
+            recipient_list=[approver.email],
+        )
+        sent += 1
+
+    logger.info(f"Recordatorios de aprobación enviados: {sent}")
+    return sent
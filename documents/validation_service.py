@@ -6,7 +6,9 @@ incluyendo las reglas de aprobación automática y manejo de rechazos.
 """
 
 from typing import List, Optional
+from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 import logging
@@ -50,10 +52,20 @@ class ValidationService:
         if len(orders) != len(set(orders)):
             raise ValidationError("No puede haber pasos con el mismo orden")
         
-        # Validar que los aprobadores pertenecen a la misma empresa
-        for step_data in steps_data:
-            approver = User.objects.get(id=step_data['approver_user_id'])
-            if approver.company != document.company:
+        # Validar que los aprobadores existen y pertenecen a la misma empresa
+        # (una sola consulta para todos los pasos)
+        approver_ids = [step['approver_user_id'] for step in steps_data]
+        approvers = {
+            str(approver.id): approver
+            for approver in User.objects.filter(id__in=approver_ids).only(
+                'id', 'company_id', 'username', 'first_name', 'last_name'
+            )
+        }
+        for approver_id in approver_ids:
+            approver = approvers.get(str(approver_id))
+            if approver is None:
+                raise ValidationError(f"Aprobador {approver_id} no existe")
+            if approver.company_id != document.company_id:
                 raise ValidationError(f"El aprobador {approver.get_full_name()} no pertenece a la empresa del documento")
         
         with transaction.atomic():
@@ -62,13 +74,15 @@ class ValidationService:
                 document=document
             )
             
-            # Crear los pasos de validación
-            for step_data in steps_data:
-                ValidationStep.objects.create(
+            # Crear los pasos de validación con un único INSERT
+            ValidationStep.objects.bulk_create([
+                ValidationStep(
                     validation_flow=validation_flow,
                     order=step_data['order'],
                     approver_id=step_data['approver_user_id']
                 )
+                for step_data in steps_data
+            ])
             
             # Marcar el documento como pendiente
             document.validation_status = 'P'
@@ -112,8 +126,12 @@ class ValidationService:
             raise ValidationError("El documento ya está aprobado")
         
         with transaction.atomic():
+            # Cargar todos los pasos una vez (ordenados por orden); la cascada
+            # y la verificación de completado trabajan sobre esta lista
+            steps = list(validation_flow.steps.all())
+            
             # Encontrar el paso del actor
-            actor_step = validation_flow.steps.filter(approver=actor).first()
+            actor_step = next((step for step in steps if step.approver_id == actor.id), None)
             if not actor_step:
                 raise ValidationError("El usuario no es aprobador en este flujo de validación")
             
@@ -137,10 +155,10 @@ class ValidationService:
             )
             
             # Aplicar regla de jerarquía: aprobar pasos previos pendientes
-            ValidationService._approve_previous_steps(validation_flow, actor_step.order)
+            ValidationService._approve_previous_steps(validation_flow, actor_step.order, actor, steps)
             
             # Verificar si el flujo está completado
-            if ValidationService._is_flow_completed(validation_flow):
+            if ValidationService._is_flow_completed(validation_flow, steps):
                 document.validation_status = 'A'
                 document.save()
                 logger.info(f"Documento {document.id} aprobado completamente")
@@ -217,36 +235,85 @@ class ValidationService:
             return action
     
     @staticmethod
-    def _approve_previous_steps(validation_flow: ValidationFlow, current_order: int) -> None:
+    def _approve_previous_steps(validation_flow: ValidationFlow, current_order: int,
+                                actor: Optional[User] = None,
+                                steps: Optional[List[ValidationStep]] = None) -> None:
         """
         Aprueba automáticamente los pasos previos pendientes.
         
+        Si `VALIDATION_CASCADE_AUDIT` está activo, se registra además una
+        acción de validación por cada paso aprobado en cascada.
+        
         Args:
             validation_flow: Flujo de validación
             current_order: Orden del paso actual
+            actor: Usuario cuya aprobación desencadenó la cascada
+            steps: Pasos del flujo ya cargados; si se omiten se consultan y,
+                si se proporcionan, se actualiza también su estado en memoria
         """
         # Obtener pasos previos pendientes
-        previous_steps = validation_flow.steps.filter(
-            order__lt=current_order,
-            status='P'
+        if steps is None:
+            previous_steps = validation_flow.steps.filter(
+                order__lt=current_order,
+                status='P'
+            )
+            ids = list(previous_steps.values_list('id', 'order'))
+        else:
+            previous_steps = [
+                step for step in steps
+                if step.order < current_order and step.is_pending()
+            ]
+            ids = [(step.id, step.order) for step in previous_steps]
+        
+        if not ids:
+            return
+        
+        # Aprobar todos los pasos previos con un único UPDATE
+        now = timezone.now()
+        validation_flow.steps.filter(id__in=[sid for sid, _ in ids]).update(
+            status='A',
+            updated_at=now
         )
+        if steps is not None:
+            for step in previous_steps:
+                step.status = 'A'
+                step.updated_at = now
+        
+        for _, order in ids:
+            logger.info(f"Paso {order} aprobado automáticamente por jerarquía")
         
-        for step in previous_steps:
-            step.status = 'A'
-            step.save()
-            logger.info(f"Paso {step.order} aprobado automáticamente por jerarquía")
+        # Registrar una acción de auditoría por paso aprobado en cascada (opcional)
+        if actor is not None and getattr(settings, 'VALIDATION_CASCADE_AUDIT', False):
+            actions = [
+                ValidationAction(
+                    document=validation_flow.document,
+                    validation_step_id=sid,
+                    actor=actor,
+                    action='A',
+                    reason='auto-jerarquía'
+                )
+                for sid, _ in ids
+            ]
+            ValidationAction.objects.bulk_create(actions, batch_size=500)
     
     @staticmethod
-    def _is_flow_completed(validation_flow: ValidationFlow) -> bool:
+    def _is_flow_completed(validation_flow: ValidationFlow,
+                           steps: Optional[List[ValidationStep]] = None) -> bool:
         """
         Verifica si el flujo de validación está completado.
         
         Args:
             validation_flow: Flujo de validación
+            steps: Pasos del flujo ya cargados, ordenados por orden; si se
+                omiten se consulta la base de datos
             
         Returns:
             True si el flujo está completado
         """
+        if steps is not None:
+            # El flujo está completado si el paso de mayor orden está aprobado
+            return bool(steps) and steps[-1].is_approved()
+        
         max_order = validation_flow.get_max_order()
         if max_order == 0:
             return False
@@ -311,13 +378,17 @@ class ValidationService:
         Returns:
             Lista de documentos pendientes de aprobación
         """
+        # Las relaciones que serializa DocumentSerializer se cargan en lote
+        # para no consultar la base de datos por cada documento
         return Document.objects.filter(
             company=user.company,
             validation_status='P',
             validation_flow__is_active=True,
             validation_flow__steps__approver=user,
             validation_flow__steps__status='P'
-        ).distinct()
+        ).select_related(
+            'company', 'entity__entity_type', 'created_by__company', 'validation_flow'
+        ).prefetch_related('validation_flow__steps__approver__company').distinct()
     
     @staticmethod
     def get_user_approval_stats(user: User) -> dict:
@@ -330,19 +401,15 @@ class ValidationService:
         Returns:
             Diccionario con estadísticas de aprobaciones
         """
-        from django.db.models import Count
-        
-        # Documentos aprobados por el usuario
-        approved_count = ValidationAction.objects.filter(
-            actor=user,
-            action='A'
-        ).count()
-        
-        # Documentos rechazados por el usuario
-        rejected_count = ValidationAction.objects.filter(
-            actor=user,
-            action='R'
-        ).count()
+        from django.db.models import Count, Q
+        
+        # Documentos aprobados y rechazados por el usuario (una sola consulta)
+        counts = ValidationAction.objects.filter(actor=user).aggregate(
+            approved=Count('id', filter=Q(action='A')),
+            rejected=Count('id', filter=Q(action='R'))
+        )
+        approved_count = counts['approved']
+        rejected_count = counts['rejected']
         
         # Documentos pendientes de aprobación
         pending_count = ValidationService.get_pending_approvals_for_user(user).count()
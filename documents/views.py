@@ -11,7 +11,9 @@ from rest_framework.response import Response
 from rest_framework.parsers import JSONParser
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import prefetch_related_objects
+from botocore.exceptions import BotoCoreError, ClientError
 import logging
 
 from .models import Document, ValidationFlow, ValidationAction
@@ -41,8 +43,8 @@ class DocumentViewSet(viewsets.ModelViewSet):
         """Retorna solo los documentos de la empresa del usuario autenticado."""
         user = self.request.user
         return Document.objects.filter(company=user.company).select_related(
-            'company', 'entity', 'created_by', 'validation_flow'
-        ).prefetch_related('validation_flow__steps__approver')
+            'company', 'entity__entity_type', 'created_by__company', 'validation_flow'
+        ).prefetch_related('validation_flow__steps__approver__company')
     
     def get_serializer_class(self):
         """Retorna el serializer apropiado según la acción."""
@@ -99,15 +101,31 @@ class DocumentViewSet(viewsets.ModelViewSet):
                         document, validation_flow_data['steps']
                     )
                 
-                # Serializar la respuesta
+                # Serializar la respuesta; los aprobadores de los pasos se
+                # cargan en lote en lugar de uno por paso
+                prefetch_related_objects([document], 'validation_flow__steps__approver__company')
                 response_serializer = DocumentSerializer(document)
                 return Response(response_serializer.data, status=status.HTTP_201_CREATED)
                 
-        except Exception as e:
-            logger.error(f"Error al crear documento: {e}")
+        except (Company.DoesNotExist, Entity.DoesNotExist):
             return Response(
-                {'error': 'Error interno del servidor'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': 'Empresa o entidad no válida'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except ValidationError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except IntegrityError:
+            return Response(
+                {'error': 'Conflicto con el estado actual del recurso'},
+                status=status.HTTP_409_CONFLICT
+            )
+        except OperationalError:
+            return Response(
+                {'error': 'Base de datos no disponible, intente de nuevo'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
     
     @action(detail=False, methods=['post'])
@@ -147,11 +165,15 @@ class DocumentViewSet(viewsets.ModelViewSet):
                 'expires_in': storage_service.expiration
             }, status=status.HTTP_200_OK)
             
-        except Exception as e:
-            logger.error(f"Error al generar URL de subida: {e}")
+        except ValidationError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except (BotoCoreError, ClientError):
             return Response(
                 {'error': 'Error al generar URL de subida'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                status=status.HTTP_502_BAD_GATEWAY
             )
     
     @action(detail=True, methods=['get'])
@@ -185,11 +207,20 @@ class DocumentViewSet(viewsets.ModelViewSet):
                 'expires_in': storage_service.expiration
             }, status=status.HTTP_200_OK)
             
-        except Exception as e:
-            logger.error(f"Error al generar URL de descarga: {e}")
+        except ValidationError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except (BotoCoreError, ClientError):
             return Response(
                 {'error': 'Error al generar URL de descarga'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                status=status.HTTP_502_BAD_GATEWAY
+            )
+        except OperationalError:
+            return Response(
+                {'error': 'Base de datos no disponible, intente de nuevo'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
     
     @action(detail=True, methods=['post'])
@@ -225,11 +256,15 @@ class DocumentViewSet(viewsets.ModelViewSet):
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        except Exception as e:
-            logger.error(f"Error al aprobar documento: {e}")
+        except IntegrityError:
             return Response(
-                {'error': 'Error interno del servidor'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': 'Conflicto con el estado actual del recurso'},
+                status=status.HTTP_409_CONFLICT
+            )
+        except OperationalError:
+            return Response(
+                {'error': 'Base de datos no disponible, intente de nuevo'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
     
     @action(detail=True, methods=['post'])
@@ -265,11 +300,15 @@ class DocumentViewSet(viewsets.ModelViewSet):
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        except Exception as e:
-            logger.error(f"Error al rechazar documento: {e}")
+        except IntegrityError:
+            return Response(
+                {'error': 'Conflicto con el estado actual del recurso'},
+                status=status.HTTP_409_CONFLICT
+            )
+        except OperationalError:
             return Response(
-                {'error': 'Error interno del servidor'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': 'Base de datos no disponible, intente de nuevo'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
     
     @action(detail=True, methods=['get'])
@@ -283,11 +322,10 @@ class DocumentViewSet(viewsets.ModelViewSet):
             status_info = ValidationService.get_validation_status(document)
             return Response(status_info, status=status.HTTP_200_OK)
             
-        except Exception as e:
-            logger.error(f"Error al obtener estado de validación: {e}")
+        except OperationalError:
             return Response(
-                {'error': 'Error interno del servidor'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': 'Base de datos no disponible, intente de nuevo'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
     
     @action(detail=False, methods=['get'])
@@ -300,11 +338,10 @@ class DocumentViewSet(viewsets.ModelViewSet):
             serializer = DocumentSerializer(pending_documents, many=True)
             return Response(serializer.data, status=status.HTTP_200_OK)
             
-        except Exception as e:
-            logger.error(f"Error al obtener documentos pendientes: {e}")
+        except OperationalError:
             return Response(
-                {'error': 'Error interno del servidor'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': 'Base de datos no disponible, intente de nuevo'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
     
     @action(detail=False, methods=['get'])
@@ -316,11 +353,10 @@ class DocumentViewSet(viewsets.ModelViewSet):
             stats = ValidationService.get_user_approval_stats(request.user)
             return Response(stats, status=status.HTTP_200_OK)
             
-        except Exception as e:
-            logger.error(f"Error al obtener estadísticas: {e}")
+        except OperationalError:
             return Response(
-                {'error': 'Error interno del servidor'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': 'Base de datos no disponible, intente de nuevo'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
     
     def destroy(self, request, pk=None):
@@ -345,9 +381,18 @@ class DocumentViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_204_NO_CONTENT
                 )
                 
-        except Exception as e:
-            logger.error(f"Error al eliminar documento: {e}")
+        except (BotoCoreError, ClientError):
             return Response(
                 {'error': 'Error al eliminar documento'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                status=status.HTTP_502_BAD_GATEWAY
+            )
+        except IntegrityError:
+            return Response(
+                {'error': 'Conflicto con el estado actual del recurso'},
+                status=status.HTTP_409_CONFLICT
+            )
+        except OperationalError:
+            return Response(
+                {'error': 'Base de datos no disponible, intente de nuevo'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
@@ -171,8 +171,10 @@ MAX_FILE_SIZE = config('MAX_FILE_SIZE', default=10485760, cast=int)  # 10MB
 ALLOWED_MIME_TYPES = config(
     'ALLOWED_MIME_TYPES',
     default='application/pdf,image/jpeg,image/png,image/gif,application/msword,application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-    cast=lambda v: [s.strip() for s in v.split(',')]
+    cast=lambda v: frozenset(s.strip() for s in v.split(','))
 )
+# Registrar una acción de auditoría por cada paso aprobado en cascada por jerarquía
+VALIDATION_CASCADE_AUDIT = config('VALIDATION_CASCADE_AUDIT', default=False, cast=bool)
 
 # Logging
 LOGGING = {
@@ -1,6 +1,27 @@
 # Configuración de producción para el sistema ERP de gestión de documentos
 
 from .base import *
+from boto3.s3.transfer import TransferConfig
+from django.core.exceptions import ImproperlyConfigured
+
+# Variables obligatorias: se resuelven una sola vez y se validan todas juntas
+# para que el worker falle al arrancar y no en la primera petición.
+_REQUIRED_ENV = (
+    'SECRET_KEY',
+    'DB_NAME', 'DB_USER', 'DB_PASSWORD', 'DB_HOST', 'DB_PORT',
+    'CORS_ALLOWED_ORIGINS',
+    'EMAIL_HOST', 'EMAIL_HOST_USER', 'EMAIL_HOST_PASSWORD',
+    'AWS_STORAGE_BUCKET_NAME', 'AWS_S3_REGION_NAME',
+    'REDIS_URL', 'CELERY_BROKER_URL', 'CELERY_RESULT_BACKEND',
+)
+_env = {key: config(key, default='') for key in _REQUIRED_ENV}
+_missing = [key for key, value in _env.items() if not value]
+if _missing:
+    raise ImproperlyConfigured(
+        f"Faltan variables de entorno requeridas en producción: {', '.join(_missing)}"
+    )
+
+SECRET_KEY = _env['SECRET_KEY']
 
 # Debug mode deshabilitado para producción
 DEBUG = False
@@ -9,20 +30,22 @@ DEBUG = False
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
-        'NAME': config('DB_NAME'),
-        'USER': config('DB_USER'),
-        'PASSWORD': config('DB_PASSWORD'),
-        'HOST': config('DB_HOST'),
-        'PORT': config('DB_PORT'),
+        'NAME': _env['DB_NAME'],
+        'USER': _env['DB_USER'],
+        'PASSWORD': _env['DB_PASSWORD'],
+        'HOST': _env['DB_HOST'],
+        'PORT': _env['DB_PORT'],
+        # Conexiones persistentes: evita el handshake TCP/TLS en cada petición
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
+# Con muchos workers de gunicorn, usar PgBouncer en modo transaction pooling
+# (y DB_CONN_MAX_AGE=0) en lugar de mantener una conexión por worker.
 
 # Configuración de CORS restrictiva para producción
 CORS_ALLOW_ALL_ORIGINS = False
-CORS_ALLOWED_ORIGINS = config(
-    'CORS_ALLOWED_ORIGINS',
-    cast=lambda v: [s.strip() for s in v.split(',')]
-)
+CORS_ALLOWED_ORIGINS = [s.strip() for s in _env['CORS_ALLOWED_ORIGINS'].split(',')]
 
 # Configuración de logging para producción
 LOGGING['handlers']['file']['level'] = 'WARNING'
@@ -32,11 +55,11 @@ LOGGING['loggers']['companies']['level'] = 'INFO'
 
 # Configuración de email para producción
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-EMAIL_HOST = config('EMAIL_HOST')
+EMAIL_HOST = _env['EMAIL_HOST']
 EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
-EMAIL_HOST_USER = config('EMAIL_HOST_USER')
-EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
+EMAIL_HOST_USER = _env['EMAIL_HOST_USER']
+EMAIL_HOST_PASSWORD = _env['EMAIL_HOST_PASSWORD']
 
 # Configuración de archivos estáticos para producción
 STATIC_ROOT = BASE_DIR / 'staticfiles'
@@ -57,9 +80,18 @@ CSRF_COOKIE_SECURE = True
 X_FRAME_OPTIONS = 'DENY'
 
 # Configuración de cloud storage para producción
-AWS_STORAGE_BUCKET_NAME = config('AWS_STORAGE_BUCKET_NAME')
-AWS_S3_REGION_NAME = config('AWS_S3_REGION_NAME')
+AWS_STORAGE_BUCKET_NAME = _env['AWS_STORAGE_BUCKET_NAME']
+AWS_S3_REGION_NAME = _env['AWS_S3_REGION_NAME']
 AWS_S3_CUSTOM_DOMAIN = config('AWS_S3_CUSTOM_DOMAIN', default='')
+AWS_S3_FILE_OVERWRITE = False
+AWS_S3_USE_SSL = True
+# Subidas multiparte en paralelo para archivos a partir de 8MB
+AWS_S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+)
 
 # Configuración de URLs pre-firmadas para producción
 PRESIGNED_URL_EXPIRATION = config('PRESIGNED_URL_EXPIRATION', default=3600, cast=int)
@@ -68,22 +100,39 @@ PRESIGNED_URL_EXPIRATION = config('PRESIGNED_URL_EXPIRATION', default=3600, cast
 MAX_FILE_SIZE = config('MAX_FILE_SIZE', default=10485760, cast=int)  # 10MB
 
 # Configuración de cache Redis para producción
+# redis-py usa automáticamente el parser en C de hiredis cuando está instalado
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': config('REDIS_URL'),
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': _env['REDIS_URL'],
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'CONNECTION_POOL_KWARGS': {
+                'max_connections': 100,
+                'socket_keepalive': True,
+            },
         }
     }
 }
 
 # Configuración de sesiones para producción
-SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+# Las sesiones son pequeñas (la API usa tokens): cookies firmadas, sin consulta a Redis.
+# Usar 'django.contrib.sessions.backends.cached_db' si se requiere durabilidad.
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.signed_cookies')
+# Solo aplica si SESSION_ENGINE se cambia a un backend con caché (cache o cached_db)
 SESSION_CACHE_ALIAS = 'default'
+SESSION_COOKIE_HTTPONLY = True
 
 # Configuración de Celery para producción
-CELERY_BROKER_URL = config('CELERY_BROKER_URL')
-CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND')
+CELERY_BROKER_URL = _env['CELERY_BROKER_URL']
+CELERY_RESULT_BACKEND = _env['CELERY_RESULT_BACKEND']
 CELERY_TASK_ALWAYS_EAGER = False
 CELERY_TASK_EAGER_PROPAGATES = False
+CELERY_BROKER_POOL_LIMIT = config('CELERY_BROKER_POOL_LIMIT', default=10, cast=int)
+CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+CELERY_BROKER_TRANSPORT_OPTIONS = {'visibility_timeout': 3600}
+CELERY_TASK_COMPRESSION = 'gzip'
+CELERY_RESULT_COMPRESSION = 'gzip'
+# Tareas largas de E/S (subidas a S3): confirmar al terminar y no acaparar mensajes
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
@@ -0,0 +1,36 @@
+# Configuración para ejecutar las pruebas rápidamente
+from .development_sqlite import *
+
+# Base de datos SQLite en memoria: sin fsync ni red en cada INSERT
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+# Hasher rápido: las pruebas crean muchos usuarios y PBKDF2 domina el setUp
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# Sin el log de cada consulta SQL que activa la configuración de desarrollo
+LOGGING['loggers']['django']['level'] = 'WARNING'
+LOGGING['loggers']['documents']['level'] = 'WARNING'
+LOGGING['loggers']['companies']['level'] = 'WARNING'
+
+# `manage.py test` reparte las clases de prueba entre los núcleos disponibles
+TEST_RUNNER = 'erp_documents.test_runner.ParallelDiscoverRunner'
+
+# nplusone hace fallar la petición si una vista carga relaciones perezosas
+# dentro de un bucle (N+1)
+INSTALLED_APPS.append('nplusone.ext.django')
+MIDDLEWARE.insert(0, 'nplusone.ext.django.NPlusOneMiddleware')
+NPLUSONE_RAISE = True
+
+# Solo se vigilan las consultas N+1: las acciones de detalle que no
+# serializan el documento (descarga, borrado, estado de validación o
+# aprobaciones rechazadas) comparten el queryset con precargas del listado
+NPLUSONE_WHITELIST = [
+    {'label': 'unused_eager_load'},
+]
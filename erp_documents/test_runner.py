@@ -0,0 +1,21 @@
+"""
+Runner de pruebas del proyecto ERP Documents.
+"""
+
+from django.test.runner import DiscoverRunner
+
+
+class ParallelDiscoverRunner(DiscoverRunner):
+    """
+    DiscoverRunner que ejecuta las pruebas en paralelo por defecto.
+
+    `manage.py test` usa un proceso por núcleo (equivale a `--parallel`);
+    `--parallel=1` vuelve a la ejecución secuencial, necesaria para `--pdb`.
+    Las clases de prueba no comparten estado de módulo ni archivos, así que
+    se pueden repartir entre procesos sin cambios.
+    """
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.set_defaults(parallel='auto')
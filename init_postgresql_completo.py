@@ -6,33 +6,71 @@ Este script configura todo el sistema para demostración y sustentación.
 
 import os
 import sys
+import json
+import logging
 import django
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from logging.handlers import MemoryHandler
 from pathlib import Path
 
-# Configurar Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'erp_documents.settings.development')
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count, Sum
 
-try:
-    django.setup()
-    print("✅ Django configurado correctamente")
-except Exception as e:
-    print(f"❌ Error configurando Django: {e}")
-    sys.exit(1)
+logger = logging.getLogger('seed')
+_log_buffer = None
 
-from django.core.management import execute_from_command_line
-from django.contrib.auth import get_user_model
-from django.db import transaction
-from companies.models import Company, Entity
-from documents.models import Document, ValidationFlow, ValidationStep
-from documents.services_test import storage_service
-import uuid
-from datetime import datetime, timedelta
+def _ensure_django():
+    """
+    Configurar Django y la salida del script una sola vez.
+    
+    Los modelos se importan dentro de cada función, de modo que importar este
+    módulo (p. ej. durante el descubrimiento de tests) no carga las apps.
+    """
+    global _log_buffer
+    if _log_buffer is not None:
+        return
+    
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'erp_documents.settings.development')
+    
+    try:
+        django.setup()
+    except Exception as e:
+        sys.exit(f"❌ Error configurando Django: {e}")
+    
+    # Salida del script: los mensajes se acumulan en memoria y se escriben en
+    # bloque, en lugar de una escritura (y flush) por cada línea. Se configura
+    # después de django.setup() porque LOGGING cierra los handlers existentes.
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    _log_buffer = MemoryHandler(capacity=500, flushLevel=logging.ERROR, target=stream_handler)
+    logger.addHandler(_log_buffer)
+    
+    logger.info("✅ Django configurado correctamente")
 
-User = get_user_model()
+# Datos de demostración (empresa, usuarios, entidades y documentos)
+SEED_PATH = Path(__file__).resolve().parent / 'fixtures' / 'seed_demo.json'
+
+# Tamaño de lote para los INSERT ... ON CONFLICT de la semilla
+BULK_CREATE_BATCH_SIZE = int(os.environ.get('BULK_CREATE_BATCH_SIZE', '100'))
+
+# Contenido fijo de los PDF simulados
+_PDF_HEADER = b'%PDF-1.4\n%Demo PDF Content\nDemo content for '
+_PDF_PADDING = b'\n' * 1000
+
+@lru_cache(maxsize=None)
+def _datos_semilla():
+    """Cargar una única vez los datos de demostración desde el JSON."""
+    with open(SEED_PATH, encoding='utf-8') as f:
+        return json.load(f)
 
 def crear_directorios():
     """Crear directorios necesarios para el sistema."""
-    print("📁 Creando directorios necesarios...")
+    logger.info("📁 Creando directorios necesarios...")
     
     directorios = [
         'logs',
@@ -47,361 +85,258 @@ def crear_directorios():
         's3_simulation/companies/fb36990a-7101-4f07-9b1f-c58bf492355b/facilities'
     ]
     
-    for directorio in directorios:
-        Path(directorio).mkdir(parents=True, exist_ok=True)
-        print(f"   ✅ {directorio}")
+    # Solo crear las hojas: mkdir(parents=True) ya crea los ancestros
+    rutas = {Path(directorio) for directorio in directorios}
+    hojas = sorted(
+        (ruta for ruta in rutas if not any(ruta in otra.parents for otra in rutas)),
+        key=lambda ruta: len(ruta.parts),
+        reverse=True
+    )
+    
+    for hoja in hojas:
+        hoja.mkdir(parents=True, exist_ok=True)
+        logger.info(f"   ✅ {hoja.as_posix()}")
 
 def ejecutar_migraciones():
     """Ejecutar migraciones de Django."""
-    print("🔄 Ejecutando migraciones...")
+    logger.info("🔄 Ejecutando migraciones...")
+    # migrate escribe directamente en stdout: vaciar antes para no desordenar
+    _log_buffer.flush()
     
     try:
-        # Crear migraciones si no existen
-        execute_from_command_line(['manage.py', 'makemigrations'])
+        # Las migraciones se versionan en el repositorio; makemigrations solo
+        # se ejecuta si se pide explícitamente (SEED_MAKEMIGRATIONS=1)
+        if os.environ.get('SEED_MAKEMIGRATIONS') == '1':
+            call_command('makemigrations')
         # Ejecutar migraciones
-        execute_from_command_line(['manage.py', 'migrate'])
-        print("   ✅ Migraciones ejecutadas correctamente")
+        call_command('migrate', interactive=False)
+        logger.info("   ✅ Migraciones ejecutadas correctamente")
     except Exception as e:
-        print(f"   ❌ Error en migraciones: {e}")
+        logger.error(f"   ❌ Error en migraciones: {e}")
         return False
     
     return True
 
 def crear_usuarios(company):
     """Crear usuarios del sistema."""
-    print("👥 Creando usuarios del sistema...")
-    
-    usuarios_data = [
-        {
-            'username': 'sustentador',
-            'email': 'sustentador@demo.com',
-            'first_name': 'Usuario',
-            'last_name': 'Sustentador',
-            'password': 'sustentacion123',
-            'company': company,
-            'is_staff': True,
-            'is_active': True
-        },
-        {
-            'username': 'aprobador1',
-            'email': 'aprobador1@demo.com',
-            'first_name': 'Supervisor',
-            'last_name': 'Aprobador',
-            'password': 'aprobador123',
-            'company': company,
-            'is_staff': True,
-            'is_active': True
-        },
-        {
-            'username': 'aprobador2',
-            'email': 'aprobador2@demo.com',
-            'first_name': 'Gerente',
-            'last_name': 'Aprobador',
-            'password': 'aprobador123',
-            'company': company,
-            'is_staff': True,
-            'is_active': True
-        },
-        {
-            'username': 'admin',
-            'email': 'admin@demo.com',
-            'first_name': 'Administrador',
-            'last_name': 'Sistema',
-            'password': 'admin123',
-            'company': company,
-            'is_staff': True,
-            'is_superuser': True,
-            'is_active': True
-        }
-    ]
+    logger.info("👥 Creando usuarios del sistema...")
     
-    usuarios_creados = {}
+    from django.contrib.auth import get_user_model
+    User = get_user_model()
     
+    usuarios_data = _datos_semilla()['usuarios']
+    
+    usernames = [user_data['username'] for user_data in usuarios_data]
+    existentes = User.objects.only('id', 'username', 'email').in_bulk(usernames, field_name='username')
+    
+    usuarios_creados = {}
+    nuevos = []
     for user_data in usuarios_data:
         username = user_data['username']
-        if not User.objects.filter(username=username).exists():
-            user = User.objects.create_user(**user_data)
-            usuarios_creados[username] = user
-            print(f"   ✅ Usuario creado: {username}")
+        user = existentes.get(username)
+        if user is not None:
+            logger.info(f"   ℹ️  Usuario existente: {username}")
         else:
-            usuarios_creados[username] = User.objects.get(username=username)
-            print(f"   ℹ️  Usuario existente: {username}")
+            datos = dict(user_data, company=company)
+            password = datos.pop('password')
+            # bulk_create no pasa por create_user, así que el hash se calcula aquí
+            user = User(**datos)
+            user.set_password(password)
+            nuevos.append(user)
+            logger.info(f"   ✅ Usuario creado: {username}")
+        usuarios_creados[username] = user
+    
+    User.objects.bulk_create(nuevos, batch_size=100, ignore_conflicts=True)
     
     return usuarios_creados
 
 def crear_empresa():
     """Crear empresa demo."""
-    print("🏢 Creando empresa demo...")
-    
-    company_id = 'fb36990a-7101-4f07-9b1f-c58bf492355b'
-    
-    if not Company.objects.filter(id=company_id).exists():
-        company = Company.objects.create(
-            id=company_id,
-            name='Empresa Sustentación Demo',
-            legal_name='Empresa Sustentación Demo S.A.S.',
-            address='Calle Demo 123, Ciudad Demo',
-            phone='+1-555-0123',
-            email='info@empresa-demo.com',
-            tax_id='123456789',
-            is_active=True
-        )
-        print(f"   ✅ Empresa creada: {company.name}")
-    else:
-        company = Company.objects.get(id=company_id)
-        print(f"   ℹ️  Empresa existente: {company.name}")
+    logger.info("🏢 Creando empresa demo...")
+    
+    from companies.models import Company
+    
+    empresa_data = _datos_semilla()['empresa']
+    
+    # UPSERT por ID: inserta o actualiza en una sola consulta, sin SELECT previo
+    company = Company(**empresa_data)
+    Company.objects.bulk_create(
+        [company],
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=['name', 'legal_name', 'address', 'phone', 'email', 'tax_id', 'is_active']
+    )
+    logger.info(f"   ✅ Empresa sincronizada: {company.name}")
     
     return company
 
 def crear_tipos_entidad():
     """Crear tipos de entidad."""
-    print("📋 Creando tipos de entidad...")
+    logger.info("📋 Creando tipos de entidad...")
     
     from companies.models import EntityType
     
-    tipos_data = [
-        {
-            'id': '01c22aa0-3eb2-38d2-81b1-085c78b65a6a',
-            'name': 'vehicle',
-            'display_name': 'Vehículo',
-            'description': 'Vehículos de la empresa',
-            'is_active': True
-        },
-        {
-            'id': '02d33bb1-4fc3-49e3-91b2-196d89c76b7b',
-            'name': 'employee',
-            'display_name': 'Empleado',
-            'description': 'Empleados de la empresa',
-            'is_active': True
-        },
-        {
-            'id': '03e44cc2-5fd4-5af4-a2c3-2a7e9ad87c8c',
-            'name': 'equipment',
-            'display_name': 'Equipo',
-            'description': 'Equipos y herramientas',
-            'is_active': True
-        }
-    ]
+    tipos_data = _datos_semilla()['tipos_entidad']
     
-    tipos_creados = {}
+    existentes = EntityType.objects.only('id', 'name', 'display_name').in_bulk(
+        [tipo_data['name'] for tipo_data in tipos_data], field_name='name'
+    )
     
+    tipos_creados = {}
+    nuevos = []
     for tipo_data in tipos_data:
-        tipo_name = tipo_data['name']
-        if not EntityType.objects.filter(name=tipo_name).exists():
-            tipo = EntityType.objects.create(**tipo_data)
-            tipos_creados[tipo_name] = tipo
-            print(f"   ✅ Tipo creado: {tipo.display_name}")
+        tipo = existentes.get(tipo_data['name'])
+        if tipo is not None:
+            logger.info(f"   ℹ️  Tipo existente: {tipo.display_name}")
         else:
-            tipo = EntityType.objects.get(name=tipo_name)
-            tipos_creados[tipo_name] = tipo
-            print(f"   ℹ️  Tipo existente: {tipo.display_name}")
+            tipo = EntityType(**tipo_data)
+            nuevos.append(tipo)
+            logger.info(f"   ✅ Tipo creado: {tipo.display_name}")
+        tipos_creados[tipo_data['name']] = tipo
+    
+    EntityType.objects.bulk_create(nuevos, batch_size=100, ignore_conflicts=True)
     
     return tipos_creados
 
 def crear_entidades(company, usuarios, tipos_entidad):
     """Crear entidades demo."""
-    print("🚗 Creando entidades demo...")
-    
-    entidades_data = [
-        {
-            'id': '02d33ab1-4fc3-49e3-91b2-196d89c76b7b',
-            'entity_type': 'vehicle',
-            'external_id': 'VEH-DEMO-001',
-            'name': 'Vehículo Demo',
-            'metadata': {
-                'brand': 'Toyota',
-                'model': 'Yaris',
-                'year': 2024,
-                'plate': 'DEMO-001',
-                'color': 'Rojo',
-                'engine': '1.5L',
-                'fuel_type': 'Gasolina',
-                'vin': '1HGBH41JXMN109186',
-                'insurance_number': 'INS-001-2024',
-                'registration_date': '2024-01-15'
-            }
-        },
-        {
-            'id': '648eda80-bf9d-408d-92c4-089c6ab821b7',
-            'entity_type': 'employee',
-            'external_id': 'EMP-DEMO-001',
-            'name': 'Empleado Demo',
-            'metadata': {
-                'first_name': 'Juan',
-                'last_name': 'Pérez',
-                'email': 'juan.perez@demo.com',
-                'position': 'Desarrollador',
-                'department': 'IT',
-                'hire_date': '2024-01-15',
-                'salary': 50000,
-                'employee_id': 'EMP-001',
-                'phone': '+1-555-0124',
-                'address': 'Calle Empleado 456, Ciudad Demo'
-            }
-        },
-        {
-            'id': 'a1b2c3d4-e5f6-7890-abcd-ef1234567890',
-            'entity_type': 'equipment',
-            'external_id': 'EQP-DEMO-001',
-            'name': 'Equipo Demo',
-            'metadata': {
-                'type': 'Laptop',
-                'brand': 'Dell',
-                'model': 'Latitude 5520',
-                'serial_number': 'DL-001-2024',
-                'purchase_date': '2024-01-10',
-                'warranty_expiry': '2025-01-10',
-                'assigned_to': 'juan.perez@demo.com',
-                'status': 'active'
-            }
-        }
-    ]
+    logger.info("🚗 Creando entidades demo...")
     
-    entidades_creadas = {}
+    from companies.models import Entity
     
+    entidades_data = _datos_semilla()['entidades']
+    
+    entidades_creadas = {}
+    entidades = []
     for entidad_data in entidades_data:
-        entity_id = entidad_data['id']
-        if not Entity.objects.filter(id=entity_id).exists():
-            entidad = Entity.objects.create(
-                id=entity_id,
-                company=company,
-                entity_type=tipos_entidad[entidad_data['entity_type']],
-                external_id=entidad_data['external_id'],
-                name=entidad_data['name'],
-                metadata=entidad_data['metadata'],
-                is_active=True
-            )
-            entidades_creadas[entidad_data['entity_type'].name] = entidad
-            print(f"   ✅ Entidad creada: {entidad.name} ({entidad.entity_type})")
-        else:
-            entidad = Entity.objects.get(id=entity_id)
-            entidades_creadas[entidad.entity_type.name] = entidad
-            print(f"   ℹ️  Entidad existente: {entidad.name} ({entidad.entity_type})")
+        entidad = Entity(
+            id=entidad_data['id'],
+            company=company,
+            entity_type=tipos_entidad[entidad_data['entity_type']],
+            external_id=entidad_data['external_id'],
+            name=entidad_data['name'],
+            metadata=entidad_data['metadata'],
+            is_active=True
+        )
+        entidades.append(entidad)
+        entidades_creadas[entidad.entity_type.name] = entidad
+    
+    Entity.objects.bulk_create(
+        entidades,
+        batch_size=BULK_CREATE_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=['name', 'external_id', 'metadata', 'is_active']
+    )
+    
+    for entidad in entidades:
+        logger.info(f"   ✅ Entidad sincronizada: {entidad.name} ({entidad.entity_type})")
     
     return entidades_creadas
 
+@lru_cache(maxsize=None)
+def _tags_semilla():
+    """Tags de la semilla como tupla inmutable y su texto para mostrar."""
+    tags = tuple(_datos_semilla()['tags'])
+    return tags, ', '.join(tags)
+
 def crear_tags():
-    """Crear tags para documentos."""
-    print("🏷️  Creando tags de documentos...")
+    """Mostrar los tags disponibles (se guardan en línea en cada documento)."""
+    logger.info("🏷️  Creando tags de documentos...")
     
-    tags_data = [
-        'demo', 'soat', 'vehiculo', 'seguro', 'contrato', 'empleado', 
-        'laboral', 'equipo', 'mantenimiento', 'factura', 'recibo', 
-        'certificado', 'licencia', 'permiso', 'manual', 'procedimiento'
-    ]
+    tags, tags_display = _tags_semilla()
+    logger.info(f"   ✅ Tags disponibles: {tags_display}")
     
-    print(f"   ✅ Tags disponibles: {', '.join(tags_data)}")
-    
-    return tags_data
+    return tags
 
-def crear_documentos(company, entidades, usuarios, tags):
+def crear_documentos(company, entidades, usuarios):
     """Crear documentos demo."""
-    print("📄 Creando documentos demo...")
-    print(f"   🔍 Entidades disponibles: {list(entidades.keys())}")
-    
-    documentos_data = [
-        {
-            'id': '05a7bcab-9015-4923-9bd3-ed54424d6fc7',
-            'name': 'SOAT Vehículo Demo.pdf',
-            'mime_type': 'application/pdf',
-            'size_bytes': 245760,
-            'bucket_key': 'companies/fb36990a-7101-4f07-9b1f-c58bf492355b/vehicles/02d33ab1-4fc3-49e3-91b2-196d89c76b7b/docs/soat-demo.pdf',
-            'file_hash': 'sha256:demo123456789',
-            'description': 'SOAT del vehículo demo para prueba del sistema',
-            'tags': ['soat', 'vehiculo', 'seguro', 'demo'],
-            'entity_type': 'vehicle',
-            'validation_steps': [
-                {'approver': 'sustentador', 'comments': 'Revisión inicial del documento'},
-                {'approver': 'aprobador1', 'comments': 'Aprobación del supervisor'},
-                {'approver': 'aprobador2', 'comments': 'Aprobación final del gerente'}
-            ]
-        },
-        {
-            'id': 'b2c3d4e5-f6a7-8901-bcde-f23456789012',
-            'name': 'Contrato Laboral Empleado.pdf',
-            'mime_type': 'application/pdf',
-            'size_bytes': 512000,
-            'bucket_key': 'companies/fb36990a-7101-4f07-9b1f-c58bf492355b/employees/648eda80-bf9d-408d-92c4-089c6ab821b7/docs/contrato-laboral.pdf',
-            'file_hash': 'sha256:contrato123456789',
-            'description': 'Contrato laboral del empleado demo',
-            'tags': ['contrato', 'empleado', 'laboral', 'demo'],
-            'entity_type': 'employee',
-            'validation_steps': [
-                {'approver': 'sustentador', 'comments': 'Revisión del contrato'},
-                {'approver': 'aprobador1', 'comments': 'Aprobación de RRHH'}
-            ]
-        },
-        {
-            'id': 'c3d4e5f6-a7b8-9012-cdef-345678901234',
-            'name': 'Manual de Equipo.pdf',
-            'mime_type': 'application/pdf',
-            'size_bytes': 1024000,
-            'bucket_key': 'companies/fb36990a-7101-4f07-9b1f-c58bf492355b/equipment/a1b2c3d4-e5f6-7890-abcd-ef1234567890/docs/manual-equipo.pdf',
-            'file_hash': 'sha256:manual123456789',
-            'description': 'Manual de usuario del equipo demo',
-            'tags': ['manual', 'equipo', 'procedimiento', 'demo'],
-            'entity_type': 'equipment',
-            'validation_steps': [
-                {'approver': 'sustentador', 'comments': 'Revisión del manual'},
-                {'approver': 'aprobador1', 'comments': 'Aprobación técnica'}
-            ]
-        }
-    ]
+    logger.info("📄 Creando documentos demo...")
+    logger.info(f"   🔍 Entidades disponibles: {list(entidades.keys())}")
+    
+    from documents.models import Document, ValidationFlow, ValidationStep
+    
+    documentos_data = _datos_semilla()['documentos']
+    
+    # Solo los flujos se consultan: los pasos de un flujo existente conservan
+    # su estado de aprobación y no se vuelven a crear
+    flujos_existentes = set(ValidationFlow.objects.filter(
+        document_id__in=[doc_data['id'] for doc_data in documentos_data]
+    ).values_list('document_id', flat=True))
     
     documentos_creados = {}
+    documentos = []
+    nuevos_flujos = []
+    nuevos_pasos = []
     
     for doc_data in documentos_data:
-        doc_id = doc_data['id']
-        if not Document.objects.filter(id=doc_id).exists():
-            # Crear documento
-            documento = Document.objects.create(
-                id=doc_id,
-                company=company,
-                entity=entidades[doc_data['entity_type']],
-                name=doc_data['name'],
-                mime_type=doc_data['mime_type'],
-                size_bytes=doc_data['size_bytes'],
-                bucket_key=doc_data['bucket_key'],
-                file_hash=doc_data['file_hash'],
-                description=doc_data['description'],
-                tags=doc_data['tags'],  # Usar el campo tags directamente
-                validation_status='P',  # Pendiente
-                created_by=usuarios['sustentador']
-            )
-            
-            # Crear flujo de validación
-            flow = ValidationFlow.objects.create(
-                document=documento,
-                is_active=True
-            )
-            
-            # Crear pasos de validación
-            for i, step_data in enumerate(doc_data['validation_steps'], 1):
-                approver_username = step_data['approver']
-                if approver_username in usuarios:
-                    ValidationStep.objects.create(
-                        validation_flow=flow,
-                        order=i,
-                        approver=usuarios[approver_username],
-                        status='P'  # Pendiente
-                    )
-            
-            documentos_creados[doc_data['entity_type']] = documento
-            print(f"   ✅ Documento creado: {documento.name}")
-        else:
-            documento = Document.objects.get(id=doc_id)
-            documentos_creados[doc_data['entity_type']] = documento
-            print(f"   ℹ️  Documento existente: {documento.name}")
+        # Los UUID se generan en Python para enlazar las FK antes de insertar
+        documento = Document(
+            id=doc_data['id'],
+            company=company,
+            entity=entidades[doc_data['entity_type']],
+            name=doc_data['name'],
+            mime_type=doc_data['mime_type'],
+            size_bytes=doc_data['size_bytes'],
+            bucket_key=doc_data['bucket_key'],
+            file_hash=doc_data['file_hash'],
+            description=doc_data['description'],
+            tags=doc_data['tags'],  # Usar el campo tags directamente
+            validation_status='P',  # Pendiente
+            created_by=usuarios['sustentador']
+        )
+        documentos.append(documento)
+        documentos_creados[doc_data['entity_type']] = documento
+        
+        if uuid.UUID(doc_data['id']) in flujos_existentes:
+            continue
+        
+        flow = ValidationFlow(
+            id=uuid.uuid4(),
+            document=documento,
+            is_active=True
+        )
+        
+        for i, step_data in enumerate(doc_data['validation_steps'], 1):
+            approver_username = step_data['approver']
+            if approver_username in usuarios:
+                nuevos_pasos.append(ValidationStep(
+                    validation_flow=flow,
+                    order=i,
+                    approver=usuarios[approver_username],
+                    status='P'  # Pendiente
+                ))
+        
+        nuevos_flujos.append(flow)
+    
+    # UPSERT de documentos: el estado de validación no se sobrescribe
+    Document.objects.bulk_create(
+        documentos,
+        batch_size=BULK_CREATE_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=[
+            'name', 'mime_type', 'size_bytes', 'bucket_key',
+            'file_hash', 'description', 'tags'
+        ]
+    )
+    ValidationFlow.objects.bulk_create(nuevos_flujos, batch_size=BULK_CREATE_BATCH_SIZE)
+    ValidationStep.objects.bulk_create(nuevos_pasos, batch_size=BULK_CREATE_BATCH_SIZE)
+    
+    for documento in documentos:
+        logger.info(f"   ✅ Documento sincronizado: {documento.name}")
     
     return documentos_creados
 
 def simular_archivos(documentos):
     """Simular archivos en el almacenamiento."""
-    print("💾 Simulando archivos en almacenamiento...")
+    from documents.services_test import storage_service
+    
+    logger.info("💾 Simulando archivos en almacenamiento...")
     
     for entity_type, documento in documentos.items():
         # Crear archivo simulado
-        file_data = b'%PDF-1.4\n%Demo PDF Content\n' + b'Demo content for ' + documento.name.encode() + b'\n' * 1000
+        file_data = b''.join((_PDF_HEADER, documento.name.encode('utf-8'), _PDF_PADDING))
         
         # Almacenar en el servicio simulado
         result = storage_service.store_file(
@@ -416,64 +351,71 @@ def simular_archivos(documentos):
         )
         
         if result:
-            print(f"   ✅ Archivo simulado: {documento.name}")
+            logger.info(f"   ✅ Archivo simulado: {documento.name}")
         else:
-            print(f"   ❌ Error simulando archivo: {documento.name}")
+            logger.error(f"   ❌ Error simulando archivo: {documento.name}")
 
 def mostrar_resumen(usuarios, company, entidades, documentos):
     """Mostrar resumen del sistema inicializado."""
-    print("\n" + "="*80)
-    print("🎉 SISTEMA ERP DE GESTIÓN DE DOCUMENTOS INICIALIZADO")
-    print("="*80)
+    from documents.models import Document
+    
+    logger.info("\n" + "="*80)
+    logger.info("🎉 SISTEMA ERP DE GESTIÓN DE DOCUMENTOS INICIALIZADO")
+    logger.info("="*80)
     
-    print(f"\n🏢 EMPRESA:")
-    print(f"   ID: {company.id}")
-    print(f"   Nombre: {company.name}")
-    print(f"   Email: {company.email}")
+    logger.info(f"\n🏢 EMPRESA:")
+    logger.info(f"   ID: {company.id}")
+    logger.info(f"   Nombre: {company.name}")
+    logger.info(f"   Email: {company.email}")
     
-    print(f"\n👥 USUARIOS:")
+    logger.info(f"\n👥 USUARIOS:")
     for username, user in usuarios.items():
-        print(f"   {username}: {user.email} (ID: {user.id})")
+        logger.info(f"   {username}: {user.email} (ID: {user.id})")
     
-    print(f"\n🚗 ENTIDADES:")
+    logger.info(f"\n🚗 ENTIDADES:")
     for entity_type, entidad in entidades.items():
-        print(f"   {entity_type}: {entidad.name} (ID: {entidad.id})")
+        logger.info(f"   {entity_type}: {entidad.name} (ID: {entidad.id})")
     
-    print(f"\n📄 DOCUMENTOS:")
+    logger.info(f"\n📄 DOCUMENTOS:")
     for entity_type, documento in documentos.items():
-        print(f"   {entity_type}: {documento.name} (ID: {documento.id})")
-    
-    print(f"\n🔑 CREDENCIALES DE ACCESO:")
-    print(f"   Sustentador: sustentador / sustentacion123")
-    print(f"   Aprobador 1: aprobador1 / aprobador123")
-    print(f"   Aprobador 2: aprobador2 / aprobador123")
-    print(f"   Admin: admin / admin123")
-    
-    print(f"\n🌐 ENDPOINTS PRINCIPALES:")
-    print(f"   API Base: http://localhost:8000/api/")
-    print(f"   Login: http://localhost:8000/api/auth/login/")
-    print(f"   Documentos: http://localhost:8000/api/documents/")
-    print(f"   Empresas: http://localhost:8000/api/companies/")
-    print(f"   Entidades: http://localhost:8000/api/entities/")
-    
-    print(f"\n📊 ESTADÍSTICAS:")
-    # Estadísticas de almacenamiento
-    print(f"   Archivos simulados: {len(documentos)}")
-    print(f"   Tamaño total: {sum(doc.size_bytes for doc in documentos.values())} bytes")
-    print(f"   Tipos MIME: {len(set(doc.mime_type for doc in documentos.values()))}")
-    
-    print(f"\n🚀 PRÓXIMOS PASOS:")
-    print(f"   1. Iniciar servidor: python manage.py runserver 8000")
-    print(f"   2. Importar colección Postman: ERP_Documents_PostgreSQL.postman_collection.json")
-    print(f"   3. Importar entorno Postman: ERP_Documents_PostgreSQL.postman_environment.json")
-    print(f"   4. Ejecutar flujo de prueba desde Postman")
-    
-    print("\n" + "="*80)
+        logger.info(f"   {entity_type}: {documento.name} (ID: {documento.id})")
+    
+    logger.info(f"\n🔑 CREDENCIALES DE ACCESO:")
+    logger.info(f"   Sustentador: sustentador / sustentacion123")
+    logger.info(f"   Aprobador 1: aprobador1 / aprobador123")
+    logger.info(f"   Aprobador 2: aprobador2 / aprobador123")
+    logger.info(f"   Admin: admin / admin123")
+    
+    logger.info(f"\n🌐 ENDPOINTS PRINCIPALES:")
+    logger.info(f"   API Base: http://localhost:8000/api/")
+    logger.info(f"   Login: http://localhost:8000/api/auth/login/")
+    logger.info(f"   Documentos: http://localhost:8000/api/documents/")
+    logger.info(f"   Empresas: http://localhost:8000/api/companies/")
+    logger.info(f"   Entidades: http://localhost:8000/api/entities/")
+    
+    logger.info(f"\n📊 ESTADÍSTICAS:")
+    # Estadísticas de almacenamiento (agregadas en la base de datos)
+    stats = Document.objects.filter(
+        id__in=[doc.id for doc in documentos.values()]
+    ).aggregate(total=Sum('size_bytes'), mimes=Count('mime_type', distinct=True))
+    logger.info(f"   Archivos simulados: {len(documentos)}")
+    logger.info(f"   Tamaño total: {stats['total'] or 0} bytes")
+    logger.info(f"   Tipos MIME: {stats['mimes']}")
+    
+    logger.info(f"\n🚀 PRÓXIMOS PASOS:")
+    logger.info(f"   1. Iniciar servidor: python manage.py runserver 8000")
+    logger.info(f"   2. Importar colección Postman: ERP_Documents_PostgreSQL.postman_collection.json")
+    logger.info(f"   3. Importar entorno Postman: ERP_Documents_PostgreSQL.postman_environment.json")
+    logger.info(f"   4. Ejecutar flujo de prueba desde Postman")
+    
+    logger.info("\n" + "="*80)
 
 def main():
     """Función principal de inicialización."""
-    print("🚀 INICIANDO CONFIGURACIÓN COMPLETA DEL SISTEMA ERP (PostgreSQL)")
-    print("="*80)
+    _ensure_django()
+    
+    logger.info("🚀 INICIANDO CONFIGURACIÓN COMPLETA DEL SISTEMA ERP (PostgreSQL)")
+    logger.info("="*80)
     
     try:
         # 1. Crear directorios
@@ -481,42 +423,44 @@ def main():
         
         # 2. Ejecutar migraciones
         if not ejecutar_migraciones():
-            print("❌ Error en migraciones. Abortando...")
+            logger.error("❌ Error en migraciones. Abortando...")
             return False
         
-        # 3. Crear empresa
-        company = crear_empresa()
-        
-        # 4. Crear usuarios
-        usuarios = crear_usuarios(company)
-        
-        # 5. Crear tipos de entidad
-        tipos_entidad = crear_tipos_entidad()
-        
-        # 6. Crear entidades
-        entidades = crear_entidades(company, usuarios, tipos_entidad)
-        
-        # 7. Crear tags
-        tags = crear_tags()
-        
-        # 8. Crear documentos
-        documentos = crear_documentos(company, entidades, usuarios, tags)
-        
-        # 9. Simular archivos
-        simular_archivos(documentos)
+        # Un único COMMIT para todos los datos; si algo falla se revierte todo
+        with transaction.atomic():
+            # 3. Crear empresa
+            company = crear_empresa()
+            
+            # 4. Crear usuarios
+            usuarios = crear_usuarios(company)
+            
+            # 5. Crear tipos de entidad
+            tipos_entidad = crear_tipos_entidad()
+            
+            # 6. Crear entidades
+            entidades = crear_entidades(company, usuarios, tipos_entidad)
+            
+            # 7. Crear tags
+            crear_tags()
+            
+            # 8. Crear documentos
+            documentos = crear_documentos(company, entidades, usuarios)
+            
+            # 9. Simular archivos
+            simular_archivos(documentos)
         
         # 10. Mostrar resumen
         mostrar_resumen(usuarios, company, entidades, documentos)
         
-        print("\n✅ SISTEMA INICIALIZADO EXITOSAMENTE")
+        logger.info("\n✅ SISTEMA INICIALIZADO EXITOSAMENTE")
         return True
         
     except Exception as e:
-        print(f"\n❌ ERROR EN LA INICIALIZACIÓN: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"\n❌ ERROR EN LA INICIALIZACIÓN: {e}")
         return False
 
 if __name__ == '__main__':
     success = main()
+    if _log_buffer is not None:
+        _log_buffer.flush()
     sys.exit(0 if success else 1)
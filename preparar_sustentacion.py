@@ -9,21 +9,28 @@ para realizar una sustentación completa del sistema.
 import os
 import sys
 import django
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
 from django.core.management import execute_from_command_line
+from django.db import transaction
 
 def setup_django():
     """Configura Django para el script."""
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'erp_documents.settings.development')
     django.setup()
 
+@transaction.atomic
 def preparar_datos_sustentacion():
-    """Prepara todos los datos necesarios para la sustentación."""
+    """
+    Prepara todos los datos necesarios para la sustentación.
+    
+    Se ejecuta en una única transacción: un solo COMMIT para todos los datos
+    y, si algo falla, no queda el entorno a medio preparar.
+    """
     print("🚀 PREPARANDO ENTORNO DE SUSTENTACIÓN")
     print("=" * 50)
     
     from companies.models import Company, User, Entity, EntityType
-    from documents.models import Document
     from django.contrib.auth.hashers import make_password
     
     # 1. Verificar/Crear empresa de sustentación
@@ -57,15 +64,20 @@ def preparar_datos_sustentacion():
         }
     ]
     
+    # Un SELECT para los existentes y un único INSERT en lote para los nuevos
+    tipos = EntityType.objects.in_bulk(
+        [tipo_data['name'] for tipo_data in tipos_entidad], field_name='name'
+    )
+    nuevos_tipos = []
     for tipo_data in tipos_entidad:
-        tipo, created = EntityType.objects.get_or_create(
-            name=tipo_data['name'],
-            defaults=tipo_data
-        )
-        if created:
-            print(f"✅ Tipo de entidad '{tipo_data['name']}' creado")
-        else:
+        if tipo_data['name'] in tipos:
             print(f"✅ Tipo de entidad '{tipo_data['name']}' ya existe")
+        else:
+            tipo = EntityType(**tipo_data)
+            tipos[tipo.name] = tipo
+            nuevos_tipos.append(tipo)
+            print(f"✅ Tipo de entidad '{tipo_data['name']}' creado")
+    EntityType.objects.bulk_create(nuevos_tipos, ignore_conflicts=True, batch_size=500)
     
     # 3. Crear usuarios de sustentación
     usuarios_data = [
@@ -104,30 +116,44 @@ def preparar_datos_sustentacion():
         }
     ]
     
+    usuarios_existentes = set(User.objects.filter(
+        username__in=[user_data['username'] for user_data in usuarios_data]
+    ).values_list('username', flat=True))
+    usuarios_nuevos_data = []
     for user_data in usuarios_data:
-        user, created = User.objects.get_or_create(
-            username=user_data['username'],
-            defaults={
-                'email': user_data['email'],
-                'password': make_password(user_data['password']),
-                'first_name': user_data['first_name'],
-                'last_name': user_data['last_name'],
-                'company': empresa,
-                'employee_id': user_data['employee_id'],
-                'phone': user_data['phone'],
-                'position': user_data['position'],
-                'department': user_data['department'],
-                'is_active': True
-            }
-        )
-        if created:
-            print(f"✅ Usuario '{user_data['username']}' creado")
-        else:
+        if user_data['username'] in usuarios_existentes:
             print(f"✅ Usuario '{user_data['username']}' ya existe")
+        else:
+            usuarios_nuevos_data.append(user_data)
+    
+    # El hash (PBKDF2) solo se calcula para los usuarios que se crean, y en
+    # paralelo: hashlib libera el GIL durante pbkdf2_hmac
+    with ThreadPoolExecutor(max_workers=max(1, len(usuarios_nuevos_data))) as executor:
+        hashes = list(executor.map(
+            make_password, [user_data['password'] for user_data in usuarios_nuevos_data]
+        ))
+    
+    nuevos_usuarios = []
+    for user_data, password_hash in zip(usuarios_nuevos_data, hashes):
+        nuevos_usuarios.append(User(
+            username=user_data['username'],
+            email=user_data['email'],
+            password=password_hash,
+            first_name=user_data['first_name'],
+            last_name=user_data['last_name'],
+            company=empresa,
+            employee_id=user_data['employee_id'],
+            phone=user_data['phone'],
+            position=user_data['position'],
+            department=user_data['department'],
+            is_active=True
+        ))
+        print(f"✅ Usuario '{user_data['username']}' creado")
+    User.objects.bulk_create(nuevos_usuarios, ignore_conflicts=True, batch_size=500)
     
     # 4. Crear entidades de demostración
-    vehiculo_tipo = EntityType.objects.get(name='vehicle')
-    empleado_tipo = EntityType.objects.get(name='employee')
+    vehiculo_tipo = tipos['vehicle']
+    empleado_tipo = tipos['employee']
     
     entidades_data = [
         {
@@ -168,29 +194,28 @@ def preparar_datos_sustentacion():
         }
     ]
     
+    entidades_existentes = set(Entity.objects.filter(
+        company=empresa,
+        external_id__in=[entidad_data['external_id'] for entidad_data in entidades_data]
+    ).values_list('entity_type_id', 'external_id'))
+    nuevas_entidades = []
     for entidad_data in entidades_data:
-        entidad, created = Entity.objects.get_or_create(
-            company=empresa,
-            entity_type=entidad_data['entity_type'],
-            external_id=entidad_data['external_id'],
-            defaults={
-                'name': entidad_data['name'],
-                'metadata': entidad_data['metadata']
-            }
-        )
-        if created:
-            print(f"✅ Entidad '{entidad_data['name']}' creada")
-        else:
+        clave = (entidad_data['entity_type'].id, entidad_data['external_id'])
+        if clave in entidades_existentes:
             print(f"✅ Entidad '{entidad_data['name']}' ya existe")
+            continue
+        nuevas_entidades.append(Entity(company=empresa, **entidad_data))
+        print(f"✅ Entidad '{entidad_data['name']}' creada")
+    Entity.objects.bulk_create(nuevas_entidades, ignore_conflicts=True, batch_size=500)
     
     # 5. Mostrar resumen
     print("\n" + "=" * 50)
     print("📊 RESUMEN DE DATOS PREPARADOS")
     print("=" * 50)
     print(f"Empresa: {empresa.name} (ID: {empresa.id})")
-    print(f"Usuarios: {User.objects.filter(company=empresa).count()}")
-    print(f"Entidades: {Entity.objects.filter(company=empresa).count()}")
-    print(f"Documentos: {Document.objects.filter(company=empresa).count()}")
+    print(f"Usuarios: {empresa.users.count()}")
+    print(f"Entidades: {empresa.entities.count()}")
+    print(f"Documentos: {empresa.documents.count()}")
     
     print("\n🔑 CREDENCIALES DE SUSTENTACIÓN:")
     print("-" * 30)
@@ -202,11 +227,23 @@ def preparar_datos_sustentacion():
     
     print("📋 IDs IMPORTANTES PARA POSTMAN:")
     print("-" * 35)
+    # Una consulta para las entidades y otra para los usuarios; se conserva la
+    # primera entidad de cada tipo según el orden del modelo, como con .first()
+    entidad_ids = {}
+    for tipo_nombre, entidad_id in Entity.objects.filter(
+        company=empresa,
+        entity_type__name__in=[vehiculo_tipo.name, empleado_tipo.name]
+    ).values_list('entity_type__name', 'id'):
+        entidad_ids.setdefault(tipo_nombre, entidad_id)
+    user_ids = dict(User.objects.filter(
+        username__in=['sustentador', 'aprobador1']
+    ).values_list('username', 'id'))
+    
     print(f"Company ID: {empresa.id}")
-    print(f"Vehicle Entity ID: {Entity.objects.filter(company=empresa, entity_type=vehiculo_tipo).first().id}")
-    print(f"Employee Entity ID: {Entity.objects.filter(company=empresa, entity_type=empleado_tipo).first().id}")
-    print(f"Sustentador User ID: {User.objects.get(username='sustentador').id}")
-    print(f"Aprobador1 User ID: {User.objects.get(username='aprobador1').id}")
+    print(f"Vehicle Entity ID: {entidad_ids[vehiculo_tipo.name]}")
+    print(f"Employee Entity ID: {entidad_ids[empleado_tipo.name]}")
+    print(f"Sustentador User ID: {user_ids['sustentador']}")
+    print(f"Aprobador1 User ID: {user_ids['aprobador1']}")
     
     print("\n🎯 PRÓXIMOS PASOS:")
     print("-" * 20)
@@ -237,4 +274,7 @@ def main():
         return 1
 
 if __name__ == '__main__':
+    # Salida en bloque: sin flush por cada línea aunque stdout sea una consola
+    # (se vacía al salir)
+    sys.stdout.reconfigure(line_buffering=False)
     sys.exit(main())
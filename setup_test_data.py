@@ -6,15 +6,21 @@ Script para crear datos de prueba del sistema ERP de gestión de documentos.
 import os
 import sys
 import django
+from django.apps import apps
 
-# Configurar Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'erp_documents.settings.development')
-django.setup()
-
-from companies.models import Company, EntityType, Entity, User
+def _ensure_django():
+    """Configurar Django solo si aún no está inicializado."""
+    if apps.ready:
+        return
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'erp_documents.settings.development')
+    django.setup()
 
 def create_test_data():
     """Crear datos de prueba para el sistema."""
+    _ensure_django()
+    
+    from django.contrib.auth.hashers import make_password
+    from companies.models import Company, EntityType, Entity, User
     
     print("🔧 Creando datos de prueba...")
     
@@ -33,86 +39,87 @@ def create_test_data():
     
     print(f"✅ Usando empresa: {company.name}")
     
-    # Crear tipos de entidad
-    vehicle_type, created = EntityType.objects.get_or_create(
-        name='vehicle',
-        defaults={
-            'display_name': 'Vehículo',
-            'description': 'Vehículos de la empresa',
-            'is_active': True
-        }
-    )
+    # Crear tipos de entidad (un INSERT en lote; los existentes se ignoran)
+    EntityType.objects.bulk_create([
+        EntityType(
+            name='vehicle',
+            display_name='Vehículo',
+            description='Vehículos de la empresa',
+            is_active=True
+        ),
+        EntityType(
+            name='employee',
+            display_name='Empleado',
+            description='Empleados de la empresa',
+            is_active=True
+        ),
+    ], ignore_conflicts=True)
     
-    employee_type, created = EntityType.objects.get_or_create(
-        name='employee',
-        defaults={
-            'display_name': 'Empleado',
-            'description': 'Empleados de la empresa',
-            'is_active': True
-        }
-    )
+    tipos = EntityType.objects.in_bulk(['vehicle', 'employee'], field_name='name')
+    vehicle_type, employee_type = tipos['vehicle'], tipos['employee']
     
     print(f"✅ Tipos de entidad: {vehicle_type.name}, {employee_type.name}")
     
     # Crear entidades de prueba
-    vehicle, created = Entity.objects.get_or_create(
-        company=company,
-        entity_type=vehicle_type,
-        external_id='VEH001',
-        defaults={
-            'name': 'Vehículo de Prueba',
-            'metadata': '{"modelo": "Toyota Corolla", "placa": "ABC123"}',
-            'is_active': True
-        }
-    )
+    Entity.objects.bulk_create([
+        Entity(
+            company=company,
+            entity_type=vehicle_type,
+            external_id='VEH001',
+            name='Vehículo de Prueba',
+            metadata={'modelo': 'Toyota Corolla', 'placa': 'ABC123'},
+            is_active=True
+        ),
+        Entity(
+            company=company,
+            entity_type=employee_type,
+            external_id='EMP001',
+            name='Juan Pérez',
+            metadata={'cargo': 'Desarrollador', 'salario': 5000000},
+            is_active=True
+        ),
+    ], ignore_conflicts=True)
     
-    employee, created = Entity.objects.get_or_create(
-        company=company,
-        entity_type=employee_type,
-        external_id='EMP001',
-        defaults={
-            'name': 'Juan Pérez',
-            'metadata': '{"cargo": "Desarrollador", "salario": 5000000}',
-            'is_active': True
-        }
-    )
+    entidades = {
+        entidad.external_id: entidad
+        for entidad in Entity.objects.filter(company=company, external_id__in=['VEH001', 'EMP001'])
+    }
+    vehicle, employee = entidades['VEH001'], entidades['EMP001']
     
     print(f"✅ Entidades creadas: {vehicle.name}, {employee.name}")
     
-    # Crear usuarios de prueba
-    user1, created = User.objects.get_or_create(
-        username='test_user1',
-        defaults={
-            'email': 'user1@test.com',
-            'password': 'pbkdf2_sha256$600000$test$test',  # Password: test123
-            'company': company,
-            'employee_id': 'EMP001',
-            'phone': '+57-1-234-5679',
-            'position': 'Aprobador',
-            'department': 'Recursos Humanos',
-            'is_company_admin': False,
-            'is_staff': False,
-            'is_active': True
-        }
-    )
-    
-    user2, created = User.objects.get_or_create(
-        username='test_user2',
-        defaults={
-            'email': 'user2@test.com',
-            'password': 'pbkdf2_sha256$600000$test$test',  # Password: test123
-            'company': company,
-            'employee_id': 'EMP002',
-            'phone': '+57-1-234-5680',
-            'position': 'Gerente',
-            'department': 'Administración',
-            'is_company_admin': True,
-            'is_staff': False,
-            'is_active': True
-        }
-    )
+    # Crear usuarios de prueba (misma contraseña: el hash se calcula una vez)
+    password = make_password('test123')
+    User.objects.bulk_create([
+        User(
+            username='test_user1',
+            email='user1@test.com',
+            password=password,
+            company=company,
+            employee_id='EMP001',
+            phone='+57-1-234-5679',
+            position='Aprobador',
+            department='Recursos Humanos',
+            is_company_admin=False,
+            is_staff=False,
+            is_active=True
+        ),
+        User(
+            username='test_user2',
+            email='user2@test.com',
+            password=password,
+            company=company,
+            employee_id='EMP002',
+            phone='+57-1-234-5680',
+            position='Gerente',
+            department='Administración',
+            is_company_admin=True,
+            is_staff=False,
+            is_active=True
+        ),
+    ], ignore_conflicts=True)
     
-    print(f"✅ Usuarios de prueba creados: {user1.username}, {user2.username}")
+    print("✅ Usuarios de prueba creados: test_user1, test_user2")
     
     print("\n🎉 Datos de prueba creados exitosamente!")
     print("\n📋 Credenciales de prueba:")
@@ -121,4 +128,7 @@ def create_test_data():
     print("   User2: test_user2 / test123")
 
 if __name__ == '__main__':
+    # Salida en bloque: sin flush por cada línea aunque stdout sea una consola
+    # (se vacía al salir)
+    sys.stdout.reconfigure(line_buffering=False)
     create_test_data()
@@ -9,14 +9,88 @@ mostrando resultados detallados y generando reportes específicos.
 import os
 import sys
 import django
+from functools import lru_cache
+from django.apps import apps
 from django.conf import settings
 from django.test.utils import get_runner
 
+# Casos de prueba disponibles: (nombre, descripción, métodos)
+_TEST_CASES = (
+    ('DocumentUploadFlowTestCase', 'Pruebas del flujo completo de subida de documentos', (
+        'test_complete_upload_flow_with_validation',
+        'test_upload_flow_without_validation',
+        'test_upload_flow_invalid_data',
+    )),
+    ('HierarchicalValidationTestCase', 'Pruebas de validación jerárquica de documentos', (
+        'test_hierarchical_approval_flow',
+        'test_terminal_rejection_flow',
+        'test_approval_permissions',
+    )),
+    ('DocumentDownloadTestCase', 'Pruebas de descarga de documentos', (
+        'test_successful_download',
+        'test_download_file_not_found',
+        'test_download_storage_error',
+        'test_download_unauthorized_access',
+    )),
+    ('DocumentManagementTestCase', 'Pruebas de gestión de documentos', (
+        'test_list_documents',
+        'test_get_document_details',
+        'test_get_validation_status',
+        'test_get_pending_approvals',
+        'test_get_approval_stats',
+        'test_delete_document',
+    )),
+    ('ErrorHandlingTestCase', 'Pruebas de manejo de errores', (
+        'test_missing_required_fields',
+        'test_invalid_uuid_format',
+        'test_nonexistent_resource',
+    )),
+    ('ErrorHandlingHTTPOnlyTestCase', 'Pruebas de errores en la capa HTTP (sin base de datos)', (
+        'test_invalid_json_format',
+        'test_unauthorized_access',
+        'test_method_not_allowed',
+    )),
+)
+
 def setup_django():
-    """Configura Django para las pruebas."""
+    """Configura Django para las pruebas (solo la primera vez)."""
+    if apps.ready:
+        return
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'erp_documents.settings.development')
     django.setup()
 
+@lru_cache(maxsize=None)
+def _get_runner_class():
+    """
+    Resuelve una sola vez la clase de runner configurada en TEST_RUNNER.
+    
+    `run_tests` solo retorna el número de fallos; la subclase captura además
+    el resultado completo para poder mostrar el resumen de la ejecución.
+    """
+    TestRunner = get_runner(settings)
+    
+    class ResultTestRunner(TestRunner):
+        def suite_result(self, suite, result, **kwargs):
+            self.result = result
+            return super().suite_result(suite, result, **kwargs)
+    
+    return ResultTestRunner
+
+def _run_tests(test_labels, **runner_kwargs):
+    """
+    Ejecuta las pruebas indicadas con el runner configurado en settings.
+    
+    Args:
+        test_labels: Rutas de las pruebas a ejecutar
+        **runner_kwargs: Opciones del runner (parallel, keepdb, ...)
+        
+    Returns:
+        Resultado (unittest.TestResult) de la ejecución
+    """
+    test_runner = _get_runner_class()(verbosity=2, **runner_kwargs)
+    test_runner.run_tests(test_labels)
+    return test_runner.result
+
 def run_test_suite():
     """Ejecuta la suite completa de pruebas de casos de uso."""
     print("🚀 Iniciando pruebas de casos de uso del sistema ERP...")
@@ -25,51 +99,30 @@ def run_test_suite():
     # Configurar Django
     setup_django()
     
-    # Configurar runner de pruebas
-    TestRunner = get_runner(settings)
-    test_runner = TestRunner()
-    
     # Definir las pruebas a ejecutar
-    test_suites = [
-        'tests.test_cases_uso.DocumentUploadFlowTestCase',
-        'tests.test_cases_uso.HierarchicalValidationTestCase',
-        'tests.test_cases_uso.DocumentDownloadTestCase',
-        'tests.test_cases_uso.DocumentManagementTestCase',
-        'tests.test_cases_uso.ErrorHandlingTestCase',
-    ]
+    test_suites = [_test_label(case_name) for case_name, _, _ in _TEST_CASES]
     
     print("📋 Casos de uso a probar:")
     for i, suite in enumerate(test_suites, 1):
         print(f"   {i}. {suite.split('.')[-1]}")
     print()
     
-    # Ejecutar cada suite de pruebas
-    results = {}
+    # Una sola ejecución para todas las suites: la base de datos de pruebas
+    # se crea una vez y los casos se reparten entre los núcleos disponibles
     total_tests = 0
     total_failures = 0
     total_errors = 0
     
-    for suite in test_suites:
-        print(f"🧪 Ejecutando: {suite.split('.')[-1]}")
-        print("-" * 40)
-        
-        try:
-            result = test_runner.run_tests([suite], verbosity=2)
-            results[suite] = result
-            
-            # Extraer estadísticas
-            if hasattr(result, 'testsRun'):
-                total_tests += result.testsRun
-            if hasattr(result, 'failures'):
-                total_failures += len(result.failures)
-            if hasattr(result, 'errors'):
-                total_errors += len(result.errors)
-                
-        except Exception as e:
-            print(f"❌ Error ejecutando {suite}: {e}")
-            total_errors += 1
-        
-        print()
+    try:
+        result = _run_tests(test_suites, parallel=os.cpu_count() or 1)
+        total_tests = result.testsRun
+        total_failures = len(result.failures)
+        total_errors = len(result.errors)
+    except Exception as e:
+        print(f"❌ Error ejecutando las pruebas: {e}")
+        total_errors += 1
+    
+    print()
     
     # Mostrar resumen
     print("=" * 60)
@@ -95,13 +148,9 @@ def run_specific_test_case(test_case_name):
     # Configurar Django
     setup_django()
     
-    # Configurar runner de pruebas
-    TestRunner = get_runner(settings)
-    test_runner = TestRunner()
-    
-    # Ejecutar prueba específica
+    # Ejecutar prueba específica (conservando la base de datos de pruebas)
     try:
-        result = test_runner.run_tests([f'tests.test_cases_uso.{test_case_name}'], verbosity=2)
+        result = _run_tests([f'tests.test_cases_uso.{test_case_name}'], keepdb=True)
         
         print("=" * 60)
         print("📊 RESULTADO")
@@ -133,15 +182,11 @@ def run_test_method(test_case_name, test_method_name):
     # Configurar Django
     setup_django()
     
-    # Configurar runner de pruebas
-    TestRunner = get_runner(settings)
-    test_runner = TestRunner()
-    
-    # Ejecutar método específico
+    # Ejecutar método específico (conservando la base de datos de pruebas)
     test_path = f'tests.test_cases_uso.{test_case_name}.{test_method_name}'
     
     try:
-        result = test_runner.run_tests([test_path], verbosity=2)
+        result = _run_tests([test_path], keepdb=True)
         
         print("=" * 60)
         print("📊 RESULTADO")
@@ -165,74 +210,104 @@ def run_test_method(test_case_name, test_method_name):
         print(f"❌ Error ejecutando método de prueba: {e}")
         return False
 
+def _test_label(test_name):
+    """Completa `CASE` o `CASE.METHOD` con el módulo de casos de uso."""
+    if test_name.startswith('tests.'):
+        return test_name
+    return f'tests.test_cases_uso.{test_name}'
+
+def run_test_methods(test_names):
+    """
+    Ejecuta varios métodos de prueba en un solo proceso.
+    
+    Todas las rutas se pasan en una única llamada al runner, así que la base
+    de datos de pruebas se prepara una sola vez para el lote completo.
+    
+    Args:
+        test_names: Pruebas como `CASE.METHOD` o rutas completas
+        
+    Returns:
+        True si todas las pruebas pasaron
+    """
+    test_paths = [_test_label(test_name) for test_name in test_names]
+    print(f"🔍 Ejecutando {len(test_paths)} prueba(s) en lote")
+    print("=" * 60)
+    
+    setup_django()
+    
+    try:
+        result = _run_tests(test_paths, keepdb=True)
+    except Exception as e:
+        print(f"❌ Error ejecutando las pruebas: {e}")
+        return False
+    
+    print("=" * 60)
+    print("📊 RESULTADO")
+    print("=" * 60)
+    print(f"Pruebas ejecutadas: {result.testsRun}")
+    print(f"Fallos: {len(result.failures)}")
+    print(f"Errores: {len(result.errors)}")
+    
+    if result.wasSuccessful():
+        print("✅ ¡Todas las pruebas del lote pasaron!")
+        return True
+    print("❌ Algunas pruebas del lote fallaron.")
+    return False
+
+def run_repl():
+    """
+    Ejecuta pruebas leídas de la entrada estándar, una por línea.
+    
+    Django se inicializa una sola vez y la base de datos de pruebas se conserva
+    entre ejecuciones, de modo que cada prueba solo paga su propio tiempo.
+    Acepta `CASE`, `CASE.METHOD` o una ruta completa `tests.modulo.CASE`.
+    """
+    setup_django()
+    
+    print("🔁 Modo interactivo: escribe CASE o CASE.METHOD (Ctrl+D para salir)")
+    all_passed = True
+    for line in sys.stdin:
+        test_name = line.strip()
+        if not test_name:
+            continue
+        test_name = _test_label(test_name)
+        
+        try:
+            result = _run_tests([test_name], keepdb=True)
+        except Exception as e:
+            print(f"❌ Error ejecutando {test_name}: {e}")
+            all_passed = False
+            continue
+        
+        passed = result.wasSuccessful()
+        all_passed = all_passed and passed
+        print(f"{'✅' if passed else '❌'} {test_name}: {result.testsRun} prueba(s), "
+              f"{len(result.failures)} fallo(s), {len(result.errors)} error(es)")
+    
+    return all_passed
+
 def show_available_tests():
     """Muestra los casos de prueba disponibles."""
     print("📋 CASOS DE PRUEBA DISPONIBLES")
     print("=" * 60)
     
-    test_cases = {
-        'DocumentUploadFlowTestCase': {
-            'description': 'Pruebas del flujo completo de subida de documentos',
-            'methods': [
-                'test_complete_upload_flow_with_validation',
-                'test_upload_flow_without_validation',
-                'test_upload_flow_invalid_data'
-            ]
-        },
-        'HierarchicalValidationTestCase': {
-            'description': 'Pruebas de validación jerárquica de documentos',
-            'methods': [
-                'test_hierarchical_approval_flow',
-                'test_terminal_rejection_flow',
-                'test_approval_permissions'
-            ]
-        },
-        'DocumentDownloadTestCase': {
-            'description': 'Pruebas de descarga de documentos',
-            'methods': [
-                'test_successful_download',
-                'test_download_file_not_found',
-                'test_download_storage_error',
-                'test_download_unauthorized_access'
-            ]
-        },
-        'DocumentManagementTestCase': {
-            'description': 'Pruebas de gestión de documentos',
-            'methods': [
-                'test_list_documents',
-                'test_get_document_details',
-                'test_get_validation_status',
-                'test_get_pending_approvals',
-                'test_get_approval_stats',
-                'test_delete_document'
-            ]
-        },
-        'ErrorHandlingTestCase': {
-            'description': 'Pruebas de manejo de errores',
-            'methods': [
-                'test_invalid_json_format',
-                'test_missing_required_fields',
-                'test_invalid_uuid_format',
-                'test_nonexistent_resource',
-                'test_unauthorized_access',
-                'test_method_not_allowed'
-            ]
-        }
-    }
-    
-    for case_name, info in test_cases.items():
-        print(f"\n🔹 {case_name}")
-        print(f"   Descripción: {info['description']}")
-        print(f"   Métodos:")
-        for method in info['methods']:
-            print(f"      - {method}")
-    
-    print("\n" + "=" * 60)
-    print("💡 COMANDOS DISPONIBLES:")
-    print("   python test_cases_uso.py                    # Ejecutar todas las pruebas")
-    print("   python test_cases_uso.py --show             # Mostrar casos disponibles")
-    print("   python test_cases_uso.py --case CASE_NAME   # Ejecutar caso específico")
-    print("   python test_cases_uso.py --method CASE.METHOD # Ejecutar método específico")
+    # Se arma todo el listado y se escribe de una sola vez
+    lines = []
+    for case_name, description, methods in _TEST_CASES:
+        lines.append(f"\n🔹 {case_name}")
+        lines.append(f"   Descripción: {description}")
+        lines.append("   Métodos:")
+        lines.extend(f"      - {method}" for method in methods)
+    
+    lines.append("\n" + "=" * 60)
+    lines.append("💡 COMANDOS DISPONIBLES:")
+    lines.append("   python test_cases_uso.py                    # Ejecutar todas las pruebas")
+    lines.append("   python test_cases_uso.py --show             # Mostrar casos disponibles")
+    lines.append("   python test_cases_uso.py --case CASE_NAME   # Ejecutar caso específico")
+    lines.append("   python test_cases_uso.py --method CASE.METHOD # Ejecutar método específico")
+    lines.append("   python test_cases_uso.py --methods CASE.METHOD ... # Ejecutar varios métodos en lote")
+    lines.append("   python test_cases_uso.py --repl             # Leer pruebas desde stdin")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Función principal del script."""
@@ -241,9 +316,16 @@ def main():
         success = run_test_suite()
         sys.exit(0 if success else 1)
     
+    elif sys.argv[1] == '--methods' and len(sys.argv) > 2:
+        success = run_test_methods(sys.argv[2:])
+        sys.exit(0 if success else 1)
+    
     elif len(sys.argv) == 2:
         if sys.argv[1] == '--show':
             show_available_tests()
+        elif sys.argv[1] == '--repl':
+            success = run_repl()
+            sys.exit(0 if success else 1)
         else:
             print("❌ Argumento no reconocido. Usa --show para ver opciones disponibles.")
             sys.exit(1)
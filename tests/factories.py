@@ -0,0 +1,97 @@
+"""
+Factories de modelos para las pruebas del sistema ERP.
+
+Concentran los valores por defecto de cada modelo para que las pruebas solo
+declaren los campos que les importan.
+"""
+
+import factory
+from django.contrib.auth.hashers import make_password
+from factory.django import DjangoModelFactory
+
+from companies.models import Company, EntityType, Entity, User
+from documents.models import Document, ValidationStep
+
+
+class CompanyFactory(DjangoModelFactory):
+    """Empresa con NIT único por secuencia."""
+
+    class Meta:
+        model = Company
+
+    name = factory.Sequence(lambda n: f"Empresa Test {n}")
+    legal_name = factory.LazyAttribute(lambda o: f"{o.name} S.A.S.")
+    tax_id = factory.Sequence(lambda n: f"800{n:06d}-0")
+    email = factory.Sequence(lambda n: f"empresa{n}@test.com")
+
+
+class EntityTypeFactory(DjangoModelFactory):
+    """Tipo de entidad; se reutiliza el existente con el mismo nombre."""
+
+    class Meta:
+        model = EntityType
+        django_get_or_create = ('name',)
+
+    name = 'vehicle'
+    display_name = 'Vehículo'
+
+
+class EntityFactory(DjangoModelFactory):
+    """Entidad de una empresa."""
+
+    class Meta:
+        model = Entity
+
+    company = factory.SubFactory(CompanyFactory)
+    entity_type = factory.SubFactory(EntityTypeFactory)
+    external_id = factory.Sequence(lambda n: f"VEH{n:03d}")
+    name = factory.Sequence(lambda n: f"Vehículo Test {n}")
+
+
+class UserFactory(DjangoModelFactory):
+    """
+    Usuario sin contraseña utilizable.
+
+    Las pruebas se autentican con token, así que no hace falta calcular el
+    hash PBKDF2 de una contraseña en cada fixture.
+    """
+
+    class Meta:
+        model = User
+
+    username = factory.Sequence(lambda n: f"user{n}")
+    email = factory.LazyAttribute(lambda o: f"{o.username}@test.com")
+    company = factory.SubFactory(CompanyFactory)
+    password = factory.LazyFunction(lambda: make_password(None))
+
+
+class DocumentFactory(DjangoModelFactory):
+    """Documento PDF de una entidad, creado por un usuario de la misma empresa."""
+
+    class Meta:
+        model = Document
+
+    company = factory.SubFactory(CompanyFactory)
+    entity = factory.SubFactory(EntityFactory, company=factory.SelfAttribute('..company'))
+    created_by = factory.SubFactory(UserFactory, company=factory.SelfAttribute('..company'))
+    name = factory.Sequence(lambda n: f"doc{n}.pdf")
+    mime_type = "application/pdf"
+    size_bytes = 1024
+    bucket_key = factory.LazyAttribute(lambda o: f"test/{o.name}")
+
+
+def bulk_create_steps(validation_flow, approvers):
+    """
+    Crea en un solo INSERT los pasos de un flujo, uno por aprobador.
+
+    Args:
+        validation_flow: Flujo al que pertenecen los pasos
+        approvers: Aprobadores en orden jerárquico (el primero es el orden 1)
+
+    Returns:
+        Lista de pasos creados, en el mismo orden
+    """
+    return ValidationStep.objects.bulk_create([
+        ValidationStep(validation_flow=validation_flow, order=order, approver=approver)
+        for order, approver in enumerate(approvers, start=1)
+    ])
@@ -8,20 +8,94 @@ incluyendo flujos completos de subida, validación jerárquica y manejo de error
 import json
 import uuid
 from unittest.mock import patch, Mock
-from django.test import TestCase, TransactionTestCase
-from django.contrib.auth import get_user_model
+from django.test import TestCase
 from django.urls import reverse
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APISimpleTestCase
 from rest_framework import status
-from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import APIException
 
 from companies.models import Company, EntityType, Entity, User
 from documents.models import Document, ValidationFlow, ValidationStep, ValidationAction
+from tests.factories import (
+    CompanyFactory, EntityTypeFactory, EntityFactory, UserFactory, DocumentFactory,
+    bulk_create_steps
+)
 
-User = get_user_model()
 
+class StorageError(APIException):
+    """
+    Falla del servicio de storage para simular en las pruebas.
+    
+    Al ser una APIException, el manejador de excepciones de DRF la convierte
+    directamente en una respuesta 500, sin pasar por la vista de error de Django.
+    """
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
 
-class DocumentUploadFlowTestCase(APITestCase):
+
+class StorageMockMixin:
+    """
+    Reemplaza el servicio de storage por un mock durante toda la clase.
+    
+    Se parchea `documents.views.storage_service`, que es el nombre que usan
+    las vistas. El patch se aplica una sola vez en setUpClass y el mock se
+    reinicia antes de cada prueba (llamadas, valores de retorno y efectos)
+    con respuestas fijas; cada prueba ajusta solo lo que necesita en
+    `self.mock_storage`.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        patcher = patch('documents.views.storage_service')
+        cls.mock_storage = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+    
+    def setUp(self):
+        super().setUp()
+        self.mock_storage.reset_mock(return_value=True, side_effect=True)
+        self.mock_storage.expiration = 3600
+        self.mock_storage.generate_bucket_key.side_effect = (
+            lambda company_id, entity_type, entity_id, filename:
+            f"{company_id}/{entity_type}/{entity_id}/{filename}"
+        )
+        self.mock_storage.generate_presigned_upload_url.return_value = {
+            'url': 'https://test-bucket.s3.amazonaws.com/',
+            'fields': {'Content-Type': 'application/pdf'}
+        }
+        self.mock_storage.file_exists.return_value = True
+        self.mock_storage.generate_presigned_download_url.return_value = (
+            'https://test-bucket.s3.amazonaws.com/download-url'
+        )
+
+
+class UseCaseAPITestCase(APITestCase):
+    """
+    Base de los casos de uso que trabajan sobre una entidad de una empresa.
+    
+    Crea una sola vez por clase la empresa, el tipo de entidad "vehicle" y la
+    entidad; cada subclase solo declara sus datos en `company_data` y
+    `entity_data` y agrega sus propios objetos en `setUpTestData`.
+    """
+    
+    company_data = {}
+    entity_data = {}
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Crea la empresa, el tipo de entidad y la entidad de la clase."""
+        cls.company = CompanyFactory(**cls.company_data)
+        cls.entity_type = EntityTypeFactory()
+        cls.entity = EntityFactory(
+            company=cls.company,
+            entity_type=cls.entity_type,
+            **cls.entity_data
+        )
+        
+        # Ruta del listado/creación de documentos, resuelta una vez con el router
+        cls._list_url = reverse('document-list')
+
+
+class DocumentUploadFlowTestCase(StorageMockMixin, UseCaseAPITestCase):
     """
     Casos de prueba para el flujo completo de subida de documentos.
     
@@ -32,40 +106,36 @@ class DocumentUploadFlowTestCase(APITestCase):
     - Manejo de errores
     """
     
-    def setUp(self):
-        """Configuración inicial para las pruebas de flujo de subida."""
-        self.company = Company.objects.create(
-            name="Empresa Test Upload",
-            legal_name="Empresa Test Upload S.A.S.",
-            tax_id="900123456-1",
-            email="upload@test.com"
-        )
-        
-        self.entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo"
-        )
-        
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
-            external_id="VEH001",
-            name="Vehículo Test Upload"
-        )
+    company_data = {
+        'name': "Empresa Test Upload",
+        'legal_name': "Empresa Test Upload S.A.S.",
+        'tax_id': "900123456-1",
+        'email': "upload@test.com"
+    }
+    entity_data = {
+        'external_id': "VEH001",
+        'name': "Vehículo Test Upload"
+    }
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de flujo de subida (se crean una vez)."""
+        super().setUpTestData()
         
-        self.user = User.objects.create_user(
+        cls.user = UserFactory(
             username="upload_user",
             email="upload@test.com",
-            password="testpass123",
-            company=self.company
+            company=cls.company
         )
         
-        # Crear token de autenticación
-        self.token = Token.objects.create(user=self.user)
-        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        cls._upload_url = reverse('document-upload-url')
+    
+    def setUp(self):
+        """El cliente es propio de cada prueba: solo se autentica el usuario."""
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
     
-    @patch('documents.services.storage_service')
-    def test_complete_upload_flow_with_validation(self, mock_storage):
+    def test_complete_upload_flow_with_validation(self):
         """
         Prueba el flujo completo de subida con validación jerárquica.
         
@@ -76,7 +146,7 @@ class DocumentUploadFlowTestCase(APITestCase):
         - Verificación de estados
         """
         # Mock de respuesta del servicio de storage
-        mock_storage.generate_presigned_upload_url.return_value = {
+        self.mock_storage.generate_presigned_upload_url.return_value = {
             'url': 'https://test-bucket.s3.amazonaws.com/upload-url',
             'fields': {'Content-Type': 'application/pdf'}
         }
@@ -91,7 +161,7 @@ class DocumentUploadFlowTestCase(APITestCase):
             "size_bytes": 123456
         }
         
-        response = self.client.post('/api/documents/upload_url/', upload_data, format='json')
+        response = self.client.post(self._upload_url, upload_data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('upload_url', response.data)
@@ -122,12 +192,17 @@ class DocumentUploadFlowTestCase(APITestCase):
             }
         }
         
-        response = self.client.post('/api/documents/', document_data, format='json')
+        # Límite de consultas: detecta regresiones N+1 en la creación
+        with self.assertNumQueries(23):
+            response = self.client.post(self._list_url, document_data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         
-        # Verificar que el documento fue creado correctamente
-        document = Document.objects.get(name="soat.pdf")
+        # Verificar que el documento fue creado correctamente (documento,
+        # relaciones y pasos del flujo se cargan en dos consultas)
+        document = Document.objects.select_related(
+            'company', 'entity', 'validation_flow'
+        ).prefetch_related('validation_flow__steps__approver').get(pk=response.data['id'])
         self.assertEqual(document.company, self.company)
         self.assertEqual(document.entity, self.entity)
         self.assertEqual(document.mime_type, "application/pdf")
@@ -139,40 +214,29 @@ class DocumentUploadFlowTestCase(APITestCase):
         # Verificar que se creó el flujo de validación
         validation_flow = document.validation_flow
         self.assertTrue(validation_flow.is_active)
-        self.assertEqual(validation_flow.steps.count(), 1)
         
-        step = validation_flow.steps.first()
+        steps = list(validation_flow.steps.all())
+        self.assertEqual(len(steps), 1)
+        
+        step = steps[0]
         self.assertEqual(step.order, 1)
         self.assertEqual(step.approver, self.user)
         self.assertEqual(step.status, 'P')
     
-    @patch('documents.services.storage_service')
-    def test_upload_flow_without_validation(self, mock_storage):
+    def test_upload_flow_without_validation(self):
         """
         Prueba el flujo de subida sin flujo de validación.
         
+        La generación de la URL de subida ya se cubre de extremo a extremo en
+        test_complete_upload_flow_with_validation; aquí se usa un bucket_key
+        fijo y solo se ejercita la creación del documento.
+        
         Casos cubiertos:
         - Creación de documento simple
         - Sin estado de validación
         - Metadatos básicos
         """
-        mock_storage.generate_presigned_upload_url.return_value = {
-            'url': 'https://test-bucket.s3.amazonaws.com/upload-url',
-            'fields': {'Content-Type': 'application/pdf'}
-        }
-        
-        # Generar URL de subida
-        upload_data = {
-            "company_id": str(self.company.id),
-            "entity_type": "vehicle",
-            "entity_id": "VEH001",
-            "filename": "manual.pdf",
-            "mime_type": "application/pdf",
-            "size_bytes": 98765
-        }
-        
-        response = self.client.post('/api/documents/upload_url/', upload_data, format='json')
-        bucket_key = response.data['bucket_key']
+        bucket_key = "test/uploaded.pdf"
         
         # Crear documento sin validación
         document_data = {
@@ -190,67 +254,67 @@ class DocumentUploadFlowTestCase(APITestCase):
             }
         }
         
-        response = self.client.post('/api/documents/', document_data, format='json')
+        response = self.client.post(self._list_url, document_data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         
-        # Verificar documento sin validación
-        document = Document.objects.get(name="manual.pdf")
+        # Verificar documento sin validación (por el id de la respuesta)
+        document = Document.objects.only('id', 'validation_status').get(pk=response.data['id'])
         self.assertIsNone(document.validation_status)
         self.assertFalse(hasattr(document, 'validation_flow'))
     
-    def test_upload_flow_invalid_data(self):
+    def test_upload_url_storage_error(self):
         """
-        Prueba el manejo de datos inválidos en el flujo de subida.
+        Prueba el manejo de errores del storage al generar la URL de subida.
         
         Casos cubiertos:
-        - Tipo MIME no permitido
-        - Tamaño de archivo excesivo
-        - Empresa inexistente
-        - Entidad inexistente
+        - Error en servicio de storage
+        - Error 500 con el mensaje del servicio
         """
-        # Tipo MIME no permitido
-        invalid_data = {
+        self.mock_storage.generate_presigned_upload_url.side_effect = StorageError(
+            {'error': "Error de conexión a S3"}
+        )
+        upload_data = {
             "company_id": str(self.company.id),
             "entity_type": "vehicle",
             "entity_id": "VEH001",
-            "filename": "virus.exe",
-            "mime_type": "application/x-executable",
-            "size_bytes": 1024
+            "filename": "soat.pdf",
+            "mime_type": "application/pdf",
+            "size_bytes": 123456
         }
         
-        response = self.client.post('/api/documents/upload_url/', invalid_data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('error', response.data)
+        response = self.client.post(self._upload_url, upload_data, format='json')
         
-        # Tamaño excesivo
-        invalid_data = {
-            "company_id": str(self.company.id),
-            "entity_type": "vehicle",
-            "entity_id": "VEH001",
-            "filename": "huge.pdf",
-            "mime_type": "application/pdf",
-            "size_bytes": 50000000  # 50MB
-        }
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.data, {'error': "Error de conexión a S3"})
+    
+    def test_upload_flow_invalid_data(self):
+        """
+        Prueba el manejo de datos inválidos en el flujo de subida.
         
-        response = self.client.post('/api/documents/upload_url/', invalid_data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        Las reglas de validación (tipo MIME, tamaño, empresa) se prueban
+        directamente sobre el serializer en test_upload_serializer; aquí
+        solo se verifica la respuesta de error del endpoint.
         
-        # Empresa inexistente
+        Casos cubiertos:
+        - Tipo MIME no permitido
+        """
+        # Tipo MIME no permitido
         invalid_data = {
-            "company_id": str(uuid.uuid4()),
+            "company_id": str(self.company.id),
             "entity_type": "vehicle",
             "entity_id": "VEH001",
-            "filename": "test.pdf",
-            "mime_type": "application/pdf",
+            "filename": "virus.exe",
+            "mime_type": "application/x-executable",
             "size_bytes": 1024
         }
         
-        response = self.client.post('/api/documents/upload_url/', invalid_data, format='json')
+        response = self.client.post(self._upload_url, invalid_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
 
 
-class HierarchicalValidationTestCase(APITestCase):
+class HierarchicalValidationTestCase(UseCaseAPITestCase):
     """
     Casos de prueba para la validación jerárquica de documentos.
     
@@ -261,96 +325,82 @@ class HierarchicalValidationTestCase(APITestCase):
     - Estados de validación
     """
     
-    def setUp(self):
-        """Configuración inicial para las pruebas de validación jerárquica."""
-        self.company = Company.objects.create(
-            name="Empresa Test Validation",
-            legal_name="Empresa Test Validation S.A.S.",
-            tax_id="900123456-2",
-            email="validation@test.com"
-        )
-        
-        self.entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo"
-        )
-        
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
-            external_id="VEH002",
-            name="Vehículo Test Validation"
-        )
+    company_data = {
+        'name': "Empresa Test Validation",
+        'legal_name': "Empresa Test Validation S.A.S.",
+        'tax_id': "900123456-2",
+        'email': "validation@test.com"
+    }
+    entity_data = {
+        'external_id': "VEH002",
+        'name': "Vehículo Test Validation"
+    }
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de validación jerárquica (se crean una vez)."""
+        super().setUpTestData()
         
         # Crear usuarios con diferentes roles
-        self.user1 = User.objects.create_user(
+        cls.user1 = UserFactory(
             username="approver1",
             email="approver1@test.com",
-            password="testpass123",
-            company=self.company,
+            company=cls.company,
             first_name="Aprobador",
             last_name="Uno"
         )
         
-        self.user2 = User.objects.create_user(
+        cls.user2 = UserFactory(
             username="approver2",
             email="approver2@test.com",
-            password="testpass123",
-            company=self.company,
+            company=cls.company,
             first_name="Aprobador",
             last_name="Dos"
         )
         
-        self.user3 = User.objects.create_user(
+        cls.user3 = UserFactory(
             username="approver3",
             email="approver3@test.com",
-            password="testpass123",
-            company=self.company,
+            company=cls.company,
             first_name="Aprobador",
             last_name="Tres"
         )
         
-        self.creator = User.objects.create_user(
+        cls.creator = UserFactory(
             username="creator",
             email="creator@test.com",
-            password="testpass123",
-            company=self.company
+            company=cls.company
         )
         
         # Crear documento con flujo de validación
-        self.document = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
+        cls.document = DocumentFactory(
+            company=cls.company,
+            entity=cls.entity,
             name="validation_test.pdf",
-            mime_type="application/pdf",
-            size_bytes=1024,
-            bucket_key="test/validation_test.pdf",
-            created_by=self.creator,
+            created_by=cls.creator,
             validation_status='P'
         )
         
         # Crear flujo de validación jerárquico
-        self.validation_flow = ValidationFlow.objects.create(
-            document=self.document
+        cls.validation_flow = ValidationFlow.objects.create(
+            document=cls.document
         )
         
-        # Crear pasos de validación
-        self.step1 = ValidationStep.objects.create(
-            validation_flow=self.validation_flow,
-            order=1,
-            approver=self.user1
+        # Crear pasos de validación en un solo INSERT
+        cls.step1, cls.step2, cls.step3 = bulk_create_steps(
+            cls.validation_flow, [cls.user1, cls.user2, cls.user3]
         )
         
-        self.step2 = ValidationStep.objects.create(
-            validation_flow=self.validation_flow,
-            order=2,
-            approver=self.user2
-        )
-        
-        self.step3 = ValidationStep.objects.create(
-            validation_flow=self.validation_flow,
-            order=3,
-            approver=self.user3
+        # URLs de las acciones del documento, resueltas una vez con el router
+        cls._approve_url = reverse('document-approve', args=[cls.document.id])
+        cls._reject_url = reverse('document-reject', args=[cls.document.id])
+    
+    def _step_statuses(self):
+        """Retorna {orden: estado} de los pasos del flujo en una sola consulta."""
+        return dict(
+            ValidationStep.objects.filter(
+                validation_flow=self.validation_flow
+            ).values_list('order', 'status')
         )
     
     def test_hierarchical_approval_flow(self):
@@ -364,8 +414,7 @@ class HierarchicalValidationTestCase(APITestCase):
         - Completado del flujo
         """
         # Autenticar como usuario de orden 2
-        token = Token.objects.create(user=self.user2)
-        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.client.force_authenticate(user=self.user2)
         
         # Paso 1: Aprobar con usuario de orden 2
         approval_data = {
@@ -374,7 +423,7 @@ class HierarchicalValidationTestCase(APITestCase):
         }
         
         response = self.client.post(
-            f'/api/documents/{self.document.id}/approve/',
+            self._approve_url,
             approval_data,
             format='json'
         )
@@ -382,13 +431,12 @@ class HierarchicalValidationTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         # Verificar que se aprobaron automáticamente los pasos previos
-        self.step1.refresh_from_db()
-        self.step2.refresh_from_db()
-        self.step3.refresh_from_db()
+        # (una sola consulta por estado de todos los pasos)
+        statuses = self._step_statuses()
         
-        self.assertEqual(self.step1.status, 'A')  # Aprobado automáticamente
-        self.assertEqual(self.step2.status, 'A')  # Aprobado por el usuario
-        self.assertEqual(self.step3.status, 'P')  # Sigue pendiente
+        self.assertEqual(statuses[1], 'A')  # Aprobado automáticamente
+        self.assertEqual(statuses[2], 'A')  # Aprobado por el usuario
+        self.assertEqual(statuses[3], 'P')  # Sigue pendiente
         
         # Verificar que el documento sigue pendiente
         self.document.refresh_from_db()
@@ -404,8 +452,7 @@ class HierarchicalValidationTestCase(APITestCase):
         self.assertEqual(action.reason, "Documento cumple con requisitos de nivel 2")
         
         # Paso 2: Aprobar con usuario de orden 3 (mayor jerarquía)
-        token = Token.objects.create(user=self.user3)
-        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.client.force_authenticate(user=self.user3)
         
         approval_data = {
             "actor_user_id": str(self.user3.id),
@@ -413,7 +460,7 @@ class HierarchicalValidationTestCase(APITestCase):
         }
         
         response = self.client.post(
-            f'/api/documents/{self.document.id}/approve/',
+            self._approve_url,
             approval_data,
             format='json'
         )
@@ -425,13 +472,7 @@ class HierarchicalValidationTestCase(APITestCase):
         self.assertEqual(self.document.validation_status, 'A')
         
         # Verificar que todos los pasos están aprobados
-        self.step1.refresh_from_db()
-        self.step2.refresh_from_db()
-        self.step3.refresh_from_db()
-        
-        self.assertEqual(self.step1.status, 'A')
-        self.assertEqual(self.step2.status, 'A')
-        self.assertEqual(self.step3.status, 'A')
+        self.assertEqual(self._step_statuses(), {1: 'A', 2: 'A', 3: 'A'})
     
     def test_terminal_rejection_flow(self):
         """
@@ -444,8 +485,7 @@ class HierarchicalValidationTestCase(APITestCase):
         - Bloqueo de nuevas acciones
         """
         # Autenticar como usuario de orden 1
-        token = Token.objects.create(user=self.user1)
-        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.client.force_authenticate(user=self.user1)
         
         # Rechazar documento
         rejection_data = {
@@ -454,7 +494,7 @@ class HierarchicalValidationTestCase(APITestCase):
         }
         
         response = self.client.post(
-            f'/api/documents/{self.document.id}/reject/',
+            self._reject_url,
             rejection_data,
             format='json'
         )
@@ -465,13 +505,12 @@ class HierarchicalValidationTestCase(APITestCase):
         self.document.refresh_from_db()
         self.assertEqual(self.document.validation_status, 'R')
         
-        # Verificar que el paso fue rechazado
-        self.step1.refresh_from_db()
-        self.assertEqual(self.step1.status, 'R')
-        
-        # Verificar que el flujo fue desactivado
-        self.validation_flow.refresh_from_db()
-        self.assertFalse(self.validation_flow.is_active)
+        # Verificar que el paso fue rechazado y el flujo desactivado
+        step1 = ValidationStep.objects.filter(pk=self.step1.pk).values(
+            'status', 'validation_flow__is_active'
+        ).get()
+        self.assertEqual(step1['status'], 'R')
+        self.assertFalse(step1['validation_flow__is_active'])
         
         # Verificar que se creó la acción de rechazo
         action = ValidationAction.objects.filter(
@@ -489,7 +528,7 @@ class HierarchicalValidationTestCase(APITestCase):
         }
         
         response = self.client.post(
-            f'/api/documents/{self.document.id}/approve/',
+            self._approve_url,
             approval_data,
             format='json'
         )
@@ -507,23 +546,21 @@ class HierarchicalValidationTestCase(APITestCase):
         - Usuario sin permisos
         """
         # Crear usuario de otra empresa
-        other_company = Company.objects.create(
+        other_company = CompanyFactory(
             name="Otra Empresa",
             legal_name="Otra Empresa S.A.S.",
             tax_id="900123456-3",
             email="otra@empresa.com"
         )
         
-        other_user = User.objects.create_user(
+        other_user = UserFactory(
             username="other_user",
             email="other@test.com",
-            password="testpass123",
             company=other_company
         )
         
         # Autenticar como usuario de otra empresa
-        token = Token.objects.create(user=other_user)
-        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.client.force_authenticate(user=other_user)
         
         # Intentar aprobar documento de otra empresa
         approval_data = {
@@ -532,7 +569,7 @@ class HierarchicalValidationTestCase(APITestCase):
         }
         
         response = self.client.post(
-            f'/api/documents/{self.document.id}/approve/',
+            self._approve_url,
             approval_data,
             format='json'
         )
@@ -541,8 +578,7 @@ class HierarchicalValidationTestCase(APITestCase):
         self.assertIn('error', response.data)
         
         # Autenticar como creador del documento (no es aprobador)
-        token = Token.objects.create(user=self.creator)
-        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.client.force_authenticate(user=self.creator)
         
         # Intentar aprobar como no aprobador
         approval_data = {
@@ -551,7 +587,7 @@ class HierarchicalValidationTestCase(APITestCase):
         }
         
         response = self.client.post(
-            f'/api/documents/{self.document.id}/approve/',
+            self._approve_url,
             approval_data,
             format='json'
         )
@@ -560,7 +596,7 @@ class HierarchicalValidationTestCase(APITestCase):
         self.assertIn('error', response.data)
 
 
-class DocumentDownloadTestCase(APITestCase):
+class DocumentDownloadTestCase(StorageMockMixin, UseCaseAPITestCase):
     """
     Casos de prueba para la descarga de documentos.
     
@@ -571,50 +607,43 @@ class DocumentDownloadTestCase(APITestCase):
     - Validación de permisos
     """
     
-    def setUp(self):
-        """Configuración inicial para las pruebas de descarga."""
-        self.company = Company.objects.create(
-            name="Empresa Test Download",
-            legal_name="Empresa Test Download S.A.S.",
-            tax_id="900123456-4",
-            email="download@test.com"
-        )
-        
-        self.entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo"
-        )
-        
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
-            external_id="VEH003",
-            name="Vehículo Test Download"
-        )
+    company_data = {
+        'name': "Empresa Test Download",
+        'legal_name': "Empresa Test Download S.A.S.",
+        'tax_id': "900123456-4",
+        'email': "download@test.com"
+    }
+    entity_data = {
+        'external_id': "VEH003",
+        'name': "Vehículo Test Download"
+    }
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de descarga (se crean una vez)."""
+        super().setUpTestData()
         
-        self.user = User.objects.create_user(
+        cls.user = UserFactory(
             username="download_user",
             email="download@test.com",
-            password="testpass123",
-            company=self.company
+            company=cls.company
         )
         
-        self.document = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
+        cls.document = DocumentFactory(
+            company=cls.company,
+            entity=cls.entity,
             name="download_test.pdf",
-            mime_type="application/pdf",
             size_bytes=2048,
-            bucket_key="test/download_test.pdf",
-            created_by=self.user
+            created_by=cls.user
         )
-        
-        # Crear token de autenticación
-        self.token = Token.objects.create(user=self.user)
-        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        cls._download_url = reverse('document-download', args=[cls.document.id])
     
-    @patch('documents.services.storage_service')
-    def test_successful_download(self, mock_storage):
+    def setUp(self):
+        """El cliente es propio de cada prueba: solo se autentica el usuario."""
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+    
+    def test_successful_download(self):
         """
         Prueba la descarga exitosa de un documento.
         
@@ -624,10 +653,10 @@ class DocumentDownloadTestCase(APITestCase):
         - Metadatos correctos
         """
         # Mock de archivo existente
-        mock_storage.file_exists.return_value = True
-        mock_storage.generate_presigned_download_url.return_value = 'https://test-bucket.s3.amazonaws.com/download-url'
+        self.mock_storage.file_exists.return_value = True
+        self.mock_storage.generate_presigned_download_url.return_value = 'https://test-bucket.s3.amazonaws.com/download-url'
         
-        response = self.client.get(f'/api/documents/{self.document.id}/download/')
+        response = self.client.get(self._download_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('download_url', response.data)
@@ -637,11 +666,10 @@ class DocumentDownloadTestCase(APITestCase):
         self.assertIn('expires_in', response.data)
         
         # Verificar que se llamaron los métodos correctos
-        mock_storage.file_exists.assert_called_once_with(self.document.bucket_key)
-        mock_storage.generate_presigned_download_url.assert_called_once_with(self.document.bucket_key)
+        self.mock_storage.file_exists.assert_called_once_with(self.document.bucket_key)
+        self.mock_storage.generate_presigned_download_url.assert_called_once_with(self.document.bucket_key)
     
-    @patch('documents.services.storage_service')
-    def test_download_file_not_found(self, mock_storage):
+    def test_download_file_not_found(self):
         """
         Prueba el manejo cuando el archivo no existe en el bucket.
         
@@ -651,16 +679,15 @@ class DocumentDownloadTestCase(APITestCase):
         - Mensaje de error descriptivo
         """
         # Mock de archivo no encontrado
-        mock_storage.file_exists.return_value = False
+        self.mock_storage.file_exists.return_value = False
         
-        response = self.client.get(f'/api/documents/{self.document.id}/download/')
+        response = self.client.get(self._download_url)
         
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertIn('error', response.data)
         self.assertEqual(response.data['error'], 'Archivo no encontrado en el bucket')
     
-    @patch('documents.services.storage_service')
-    def test_download_storage_error(self, mock_storage):
+    def test_download_storage_error(self):
         """
         Prueba el manejo de errores del servicio de storage.
         
@@ -670,12 +697,13 @@ class DocumentDownloadTestCase(APITestCase):
         - Logging de errores
         """
         # Mock de error en servicio
-        mock_storage.file_exists.side_effect = Exception("Error de conexión a S3")
+        self.mock_storage.file_exists.side_effect = StorageError({'error': "Error de conexión a S3"})
         
-        response = self.client.get(f'/api/documents/{self.document.id}/download/')
+        response = self.client.get(self._download_url)
         
         self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
-        self.assertIn('error', response.data)
+        self.assertEqual(response.data, {'error': "Error de conexión a S3"})
+        self.mock_storage.generate_presigned_download_url.assert_not_called()
     
     def test_download_unauthorized_access(self):
         """
@@ -687,37 +715,35 @@ class DocumentDownloadTestCase(APITestCase):
         - Sin autenticación
         """
         # Crear usuario de otra empresa
-        other_company = Company.objects.create(
+        other_company = CompanyFactory(
             name="Otra Empresa",
             legal_name="Otra Empresa S.A.S.",
             tax_id="900123456-5",
             email="otra2@empresa.com"
         )
         
-        other_user = User.objects.create_user(
+        other_user = UserFactory(
             username="other_user2",
             email="other2@test.com",
-            password="testpass123",
             company=other_company
         )
         
         # Autenticar como usuario de otra empresa
-        token = Token.objects.create(user=other_user)
-        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.client.force_authenticate(user=other_user)
         
         # Intentar descargar documento de otra empresa
-        response = self.client.get(f'/api/documents/{self.document.id}/download/')
+        response = self.client.get(self._download_url)
         
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         
         # Probar sin autenticación
-        self.client.credentials()
-        response = self.client.get(f'/api/documents/{self.document.id}/download/')
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self._download_url)
         
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class DocumentManagementTestCase(APITestCase):
+class DocumentManagementTestCase(StorageMockMixin, UseCaseAPITestCase):
     """
     Casos de prueba para la gestión completa de documentos.
     
@@ -728,99 +754,57 @@ class DocumentManagementTestCase(APITestCase):
     - Eliminación
     """
     
-    def setUp(self):
-        """Configuración inicial para las pruebas de gestión."""
-        self.company = Company.objects.create(
-            name="Empresa Test Management",
-            legal_name="Empresa Test Management S.A.S.",
-            tax_id="900123456-6",
-            email="management@test.com"
-        )
-        
-        self.entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo"
-        )
-        
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
-            external_id="VEH004",
-            name="Vehículo Test Management"
-        )
+    company_data = {
+        'name': "Empresa Test Management",
+        'legal_name': "Empresa Test Management S.A.S.",
+        'tax_id': "900123456-6",
+        'email': "management@test.com"
+    }
+    entity_data = {
+        'external_id': "VEH004",
+        'name': "Vehículo Test Management"
+    }
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de gestión (se crean una vez)."""
+        super().setUpTestData()
         
-        self.user = User.objects.create_user(
+        cls.user = UserFactory(
             username="management_user",
             email="management@test.com",
-            password="testpass123",
-            company=self.company
+            company=cls.company
         )
         
-        # Crear múltiples documentos con diferentes estados
-        self.documents = []
-        
-        # Documento sin validación
-        doc1 = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
-            name="doc1.pdf",
-            mime_type="application/pdf",
-            size_bytes=1024,
-            bucket_key="test/doc1.pdf",
-            created_by=self.user
-        )
-        self.documents.append(doc1)
-        
-        # Documento pendiente
-        doc2 = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
-            name="doc2.pdf",
-            mime_type="application/pdf",
-            size_bytes=2048,
-            bucket_key="test/doc2.pdf",
-            created_by=self.user,
-            validation_status='P'
-        )
+        # Crear múltiples documentos con diferentes estados en un solo INSERT:
+        # sin validación, pendiente, aprobado y rechazado
+        cls.documents = Document.objects.bulk_create([
+            DocumentFactory.build(
+                company=cls.company,
+                entity=cls.entity,
+                name=f"doc{i}.pdf",
+                size_bytes=1024 * i,
+                created_by=cls.user,
+                validation_status=validation_status
+            )
+            for i, validation_status in enumerate([None, 'P', 'A', 'R'], start=1)
+        ])
         
         # Crear flujo de validación para doc2
-        validation_flow = ValidationFlow.objects.create(document=doc2)
+        validation_flow = ValidationFlow.objects.create(document=cls.documents[1])
         ValidationStep.objects.create(
             validation_flow=validation_flow,
             order=1,
-            approver=self.user
-        )
-        self.documents.append(doc2)
-        
-        # Documento aprobado
-        doc3 = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
-            name="doc3.pdf",
-            mime_type="application/pdf",
-            size_bytes=3072,
-            bucket_key="test/doc3.pdf",
-            created_by=self.user,
-            validation_status='A'
-        )
-        self.documents.append(doc3)
-        
-        # Documento rechazado
-        doc4 = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
-            name="doc4.pdf",
-            mime_type="application/pdf",
-            size_bytes=4096,
-            bucket_key="test/doc4.pdf",
-            created_by=self.user,
-            validation_status='R'
+            approver=cls.user
         )
-        self.documents.append(doc4)
         
-        # Crear token de autenticación
-        self.token = Token.objects.create(user=self.user)
-        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        cls._pending_approvals_url = reverse('document-pending-approvals')
+        cls._approval_stats_url = reverse('document-approval-stats')
+    
+    def setUp(self):
+        """El cliente es propio de cada prueba: solo se autentica el usuario."""
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
     
     def test_list_documents(self):
         """
@@ -831,7 +815,10 @@ class DocumentManagementTestCase(APITestCase):
         - Paginación
         - Ordenamiento
         """
-        response = self.client.get('/api/documents/')
+        # Límite de consultas para los 4 documentos del fixture: si el listado
+        # empieza a consultar más por cada documento, la prueba falla
+        with self.assertNumQueries(10):
+            response = self.client.get(self._list_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('results', response.data)
@@ -853,7 +840,7 @@ class DocumentManagementTestCase(APITestCase):
         - Metadatos
         - Estados de validación
         """
-        response = self.client.get(f'/api/documents/{self.documents[0].id}/')
+        response = self.client.get(reverse('document-detail', args=[self.documents[0].id]))
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['name'], 'doc1.pdf')
@@ -872,8 +859,12 @@ class DocumentManagementTestCase(APITestCase):
         - Documento sin validación
         - Información de pasos
         """
+        # Límites de consultas
         # Documento con validación
-        response = self.client.get(f'/api/documents/{self.documents[1].id}/validation_status/')
+        with self.assertNumQueries(5):
+            response = self.client.get(
+                reverse('document-validation-status', args=[self.documents[1].id])
+            )
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(response.data['has_validation'])
@@ -884,7 +875,10 @@ class DocumentManagementTestCase(APITestCase):
         self.assertEqual(len(response.data['steps']), 1)
         
         # Documento sin validación
-        response = self.client.get(f'/api/documents/{self.documents[0].id}/validation_status/')
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('document-validation-status', args=[self.documents[0].id])
+            )
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertFalse(response.data['has_validation'])
@@ -899,7 +893,9 @@ class DocumentManagementTestCase(APITestCase):
         - Filtrado por estado
         - Usuario aprobador
         """
-        response = self.client.get('/api/documents/pending_approvals/')
+        # Límite de consultas
+        with self.assertNumQueries(9):
+            response = self.client.get(self._pending_approvals_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)  # Solo doc2 está pendiente
@@ -913,7 +909,10 @@ class DocumentManagementTestCase(APITestCase):
         - Contadores correctos
         - Estadísticas por usuario
         """
-        response = self.client.get('/api/documents/approval_stats/')
+        # Límite de consultas: las estadísticas no deben depender del número
+        # de documentos
+        with self.assertNumQueries(2):
+            response = self.client.get(self._approval_stats_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('approved', response.data)
@@ -921,8 +920,7 @@ class DocumentManagementTestCase(APITestCase):
         self.assertIn('pending', response.data)
         self.assertIn('total_actions', response.data)
     
-    @patch('documents.services.storage_service')
-    def test_delete_document(self, mock_storage):
+    def test_delete_document(self):
         """
         Prueba la eliminación de documentos.
         
@@ -932,10 +930,10 @@ class DocumentManagementTestCase(APITestCase):
         - Eliminación del registro en BD
         """
         # Mock de eliminación exitosa
-        mock_storage.delete_file.return_value = True
+        self.mock_storage.delete_file.return_value = True
         
         document_id = self.documents[0].id
-        response = self.client.delete(f'/api/documents/{document_id}/')
+        response = self.client.delete(reverse('document-detail', args=[document_id]))
         
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         
@@ -943,51 +941,40 @@ class DocumentManagementTestCase(APITestCase):
         self.assertFalse(Document.objects.filter(id=document_id).exists())
         
         # Verificar que se llamó la eliminación del archivo
-        mock_storage.delete_file.assert_called_once_with(self.documents[0].bucket_key)
+        self.mock_storage.delete_file.assert_called_once_with(self.documents[0].bucket_key)
 
 
 class ErrorHandlingTestCase(APITestCase):
     """
-    Casos de prueba para el manejo de errores.
+    Casos de prueba para el manejo de errores que dependen de datos.
     
     Cubre:
     - Errores de validación
-    - Errores de permisos
     - Errores de sistema
     - Mensajes de error apropiados
     """
     
-    def setUp(self):
-        """Configuración inicial para las pruebas de manejo de errores."""
-        self.company = Company.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de manejo de errores (se crean una vez)."""
+        cls.company = CompanyFactory(
             name="Empresa Test Errors",
             legal_name="Empresa Test Errors S.A.S.",
             tax_id="900123456-7",
             email="errors@test.com"
         )
         
-        self.user = User.objects.create_user(
+        cls.user = UserFactory(
             username="error_user",
             email="error@test.com",
-            password="testpass123",
-            company=self.company
+            company=cls.company
         )
         
-        # Crear token de autenticación
-        self.token = Token.objects.create(user=self.user)
-        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        cls._list_url = reverse('document-list')
     
-    def test_invalid_json_format(self):
-        """
-        Prueba el manejo de JSON inválido.
-        """
-        response = self.client.post(
-            '/api/documents/',
-            'invalid json',
-            content_type='application/json'
-        )
-        
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    def setUp(self):
+        """El cliente es propio de cada prueba: solo se autentica el usuario."""
+        self.client.force_authenticate(user=self.user)
     
     def test_missing_required_fields(self):
         """
@@ -998,7 +985,7 @@ class ErrorHandlingTestCase(APITestCase):
             # Faltan campos requeridos
         }
         
-        response = self.client.post('/api/documents/', incomplete_data, format='json')
+        response = self.client.post(self._list_url, incomplete_data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('error', response.data)
@@ -1021,7 +1008,7 @@ class ErrorHandlingTestCase(APITestCase):
             }
         }
         
-        response = self.client.post('/api/documents/', invalid_data, format='json')
+        response = self.client.post(self._list_url, invalid_data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
@@ -1031,18 +1018,48 @@ class ErrorHandlingTestCase(APITestCase):
         """
         fake_id = str(uuid.uuid4())
         
-        response = self.client.get(f'/api/documents/{fake_id}/')
+        response = self.client.get(reverse('document-detail', args=[fake_id]))
         
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ErrorHandlingHTTPOnlyTestCase(APISimpleTestCase):
+    """
+    Casos de prueba para errores que se resuelven en la capa HTTP.
+    
+    Ninguna de estas respuestas llega a consultar la base de datos, así que
+    no se crean empresa, usuario ni token. El usuario autenticado no se guarda:
+    basta para pasar la verificación de permisos.
+    
+    Cubre:
+    - JSON inválido
+    - Errores de permisos
+    - Métodos no permitidos
+    """
+    
+    def setUp(self):
+        """Autentica un usuario en memoria, sin base de datos."""
+        self.client.force_authenticate(user=User(username="error_user"))
+    
+    def test_invalid_json_format(self):
+        """
+        Prueba el manejo de JSON inválido.
+        """
+        response = self.client.post(
+            reverse('document-list'),
+            'invalid json',
+            content_type='application/json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
     def test_unauthorized_access(self):
         """
         Prueba el acceso no autorizado.
         """
-        # Sin autenticación
-        self.client.credentials()
-        
-        response = self.client.get('/api/documents/')
+        # Sin autenticación: cliente nuevo (cerrar la sesión del actual
+        # escribiría en la tabla de sesiones)
+        response = self.client_class().get(reverse('document-list'))
         
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
     
@@ -1050,6 +1067,6 @@ class ErrorHandlingTestCase(APITestCase):
         """
         Prueba métodos HTTP no permitidos.
         """
-        response = self.client.patch('/api/documents/')
+        response = self.client.patch(reverse('document-list'))
         
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
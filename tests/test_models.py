@@ -8,25 +8,22 @@ documentos y flujos de validación.
 import uuid
 from django.test import TestCase
 from django.core.exceptions import ValidationError
-from django.contrib.auth import get_user_model
 
 from companies.models import Company, Entity, EntityType, User
 from documents.models import Document, ValidationFlow, ValidationStep, ValidationAction
-
-User = get_user_model()
+from tests.factories import (
+    CompanyFactory, EntityTypeFactory, EntityFactory, UserFactory, DocumentFactory,
+    bulk_create_steps
+)
 
 
 class CompanyModelTest(TestCase):
     """Pruebas para el modelo Company."""
     
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.company = Company.objects.create(
-            name="Empresa Test",
-            legal_name="Empresa Test S.A.S.",
-            tax_id="900123456-1",
-            email="test@empresa.com"
-        )
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.company = CompanyFactory(name="Empresa Test", tax_id="900123456-1")
     
     def test_company_creation(self):
         """Prueba la creación de una empresa."""
@@ -43,16 +40,14 @@ class CompanyModelTest(TestCase):
     def test_company_users_count(self):
         """Prueba el conteo de usuarios activos."""
         # Crear usuarios
-        User.objects.create_user(
+        UserFactory(
             username="user1",
             email="user1@test.com",
-            password="testpass123",
             company=self.company
         )
-        User.objects.create_user(
+        UserFactory(
             username="user2",
             email="user2@test.com",
-            password="testpass123",
             company=self.company,
             is_active=False
         )
@@ -62,27 +57,20 @@ class CompanyModelTest(TestCase):
     def test_company_documents_count(self):
         """Prueba el conteo de documentos."""
         # Crear entidad y documento
-        entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo"
-        )
-        entity = Entity.objects.create(
+        entity_type = EntityTypeFactory()
+        entity = EntityFactory(
             company=self.company,
             entity_type=entity_type,
             external_id="VEH001",
             name="Vehículo Test"
         )
-        Document.objects.create(
+        DocumentFactory(
             company=self.company,
             entity=entity,
             name="test.pdf",
-            mime_type="application/pdf",
-            size_bytes=1024,
-            bucket_key="test/test.pdf",
-            created_by=User.objects.create_user(
+            created_by=UserFactory(
                 username="creator",
                 email="creator@test.com",
-                password="testpass123",
                 company=self.company
             )
         )
@@ -93,11 +81,10 @@ class CompanyModelTest(TestCase):
 class EntityTypeModelTest(TestCase):
     """Pruebas para el modelo EntityType."""
     
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo",
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.entity_type = EntityTypeFactory(
             description="Tipo de entidad para vehículos"
         )
     
@@ -115,21 +102,14 @@ class EntityTypeModelTest(TestCase):
 class EntityModelTest(TestCase):
     """Pruebas para el modelo Entity."""
     
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.company = Company.objects.create(
-            name="Empresa Test",
-            legal_name="Empresa Test S.A.S.",
-            tax_id="900123456-1",
-            email="test@empresa.com"
-        )
-        self.entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo"
-        )
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.company = CompanyFactory(name="Empresa Test", tax_id="900123456-1")
+        cls.entity_type = EntityTypeFactory()
+        cls.entity = EntityFactory(
+            company=cls.company,
+            entity_type=cls.entity_type,
             external_id="VEH001",
             name="Vehículo Test"
         )
@@ -159,17 +139,13 @@ class EntityModelTest(TestCase):
     
     def test_entity_documents_count(self):
         """Prueba el conteo de documentos de la entidad."""
-        Document.objects.create(
+        DocumentFactory(
             company=self.company,
             entity=self.entity,
             name="test.pdf",
-            mime_type="application/pdf",
-            size_bytes=1024,
-            bucket_key="test/test.pdf",
-            created_by=User.objects.create_user(
+            created_by=UserFactory(
                 username="creator",
                 email="creator@test.com",
-                password="testpass123",
                 company=self.company
             )
         )
@@ -180,19 +156,14 @@ class EntityModelTest(TestCase):
 class UserModelTest(TestCase):
     """Pruebas para el modelo User."""
     
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.company = Company.objects.create(
-            name="Empresa Test",
-            legal_name="Empresa Test S.A.S.",
-            tax_id="900123456-1",
-            email="test@empresa.com"
-        )
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.company = CompanyFactory(name="Empresa Test", tax_id="900123456-1")
+        cls.user = UserFactory(
             username="testuser",
             email="test@test.com",
-            password="testpass123",
-            company=self.company,
+            company=cls.company,
             first_name="Test",
             last_name="User"
         )
@@ -236,38 +207,27 @@ class UserModelTest(TestCase):
 class DocumentModelTest(TestCase):
     """Pruebas para el modelo Document."""
     
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.company = Company.objects.create(
-            name="Empresa Test",
-            legal_name="Empresa Test S.A.S.",
-            tax_id="900123456-1",
-            email="test@empresa.com"
-        )
-        self.entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo"
-        )
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.company = CompanyFactory(name="Empresa Test", tax_id="900123456-1")
+        cls.entity_type = EntityTypeFactory()
+        cls.entity = EntityFactory(
+            company=cls.company,
+            entity_type=cls.entity_type,
             external_id="VEH001",
             name="Vehículo Test"
         )
-        self.user = User.objects.create_user(
+        cls.user = UserFactory(
             username="testuser",
             email="test@test.com",
-            password="testpass123",
-            company=self.company
+            company=cls.company
         )
-        self.document = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
+        cls.document = DocumentFactory(
+            company=cls.company,
+            entity=cls.entity,
             name="test.pdf",
-            mime_type="application/pdf",
-            size_bytes=1024,
-            bucket_key="test/test.pdf",
-            created_by=self.user
+            created_by=cls.user
         )
     
     def test_document_creation(self):
@@ -296,71 +256,50 @@ class DocumentModelTest(TestCase):
     
     def test_document_validation_status(self):
         """Prueba los métodos de estado de validación."""
-        # Sin validación
-        self.assertFalse(self.document.is_validated())
-        self.assertFalse(self.document.is_pending())
-        self.assertFalse(self.document.is_rejected())
-        
-        # Pendiente
-        self.document.validation_status = 'P'
-        self.document.save()
-        self.assertFalse(self.document.is_validated())
-        self.assertTrue(self.document.is_pending())
-        self.assertFalse(self.document.is_rejected())
-        
-        # Aprobado
-        self.document.validation_status = 'A'
-        self.document.save()
-        self.assertTrue(self.document.is_validated())
-        self.assertFalse(self.document.is_pending())
-        self.assertFalse(self.document.is_rejected())
-        
-        # Rechazado
-        self.document.validation_status = 'R'
-        self.document.save()
-        self.assertFalse(self.document.is_validated())
-        self.assertFalse(self.document.is_pending())
-        self.assertTrue(self.document.is_rejected())
+        # Los métodos solo leen validation_status: se prueba cada estado en
+        # memoria, sin guardar el documento
+        # (estado, validado, pendiente, rechazado)
+        cases = [
+            (None, False, False, False),  # Sin validación
+            ('P', False, True, False),    # Pendiente
+            ('A', True, False, False),    # Aprobado
+            ('R', False, False, True),    # Rechazado
+        ]
+        for validation_status, validated, pending, rejected in cases:
+            with self.subTest(validation_status=validation_status):
+                self.document.validation_status = validation_status
+                self.assertEqual(self.document.is_validated(), validated)
+                self.assertEqual(self.document.is_pending(), pending)
+                self.assertEqual(self.document.is_rejected(), rejected)
 
 
 class ValidationFlowModelTest(TestCase):
     """Pruebas para el modelo ValidationFlow."""
     
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.company = Company.objects.create(
-            name="Empresa Test",
-            legal_name="Empresa Test S.A.S.",
-            tax_id="900123456-1",
-            email="test@empresa.com"
-        )
-        self.entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo"
-        )
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.company = CompanyFactory(name="Empresa Test", tax_id="900123456-1")
+        cls.entity_type = EntityTypeFactory()
+        cls.entity = EntityFactory(
+            company=cls.company,
+            entity_type=cls.entity_type,
             external_id="VEH001",
             name="Vehículo Test"
         )
-        self.user = User.objects.create_user(
+        cls.user = UserFactory(
             username="testuser",
             email="test@test.com",
-            password="testpass123",
-            company=self.company
+            company=cls.company
         )
-        self.document = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
+        cls.document = DocumentFactory(
+            company=cls.company,
+            entity=cls.entity,
             name="test.pdf",
-            mime_type="application/pdf",
-            size_bytes=1024,
-            bucket_key="test/test.pdf",
-            created_by=self.user
+            created_by=cls.user
         )
-        self.validation_flow = ValidationFlow.objects.create(
-            document=self.document
+        cls.validation_flow = ValidationFlow.objects.create(
+            document=cls.document
         )
     
     def test_validation_flow_creation(self):
@@ -375,17 +314,8 @@ class ValidationFlowModelTest(TestCase):
     
     def test_validation_flow_steps(self):
         """Prueba la gestión de pasos del flujo de validación."""
-        # Crear pasos
-        step1 = ValidationStep.objects.create(
-            validation_flow=self.validation_flow,
-            order=1,
-            approver=self.user
-        )
-        step2 = ValidationStep.objects.create(
-            validation_flow=self.validation_flow,
-            order=2,
-            approver=self.user
-        )
+        # Crear pasos (un solo INSERT)
+        bulk_create_steps(self.validation_flow, [self.user, self.user])
         
         # Probar métodos
         steps = self.validation_flow.get_steps()
@@ -438,46 +368,35 @@ class ValidationFlowModelTest(TestCase):
 class ValidationStepModelTest(TestCase):
     """Pruebas para el modelo ValidationStep."""
     
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.company = Company.objects.create(
-            name="Empresa Test",
-            legal_name="Empresa Test S.A.S.",
-            tax_id="900123456-1",
-            email="test@empresa.com"
-        )
-        self.entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo"
-        )
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.company = CompanyFactory(name="Empresa Test", tax_id="900123456-1")
+        cls.entity_type = EntityTypeFactory()
+        cls.entity = EntityFactory(
+            company=cls.company,
+            entity_type=cls.entity_type,
             external_id="VEH001",
             name="Vehículo Test"
         )
-        self.user = User.objects.create_user(
+        cls.user = UserFactory(
             username="testuser",
             email="test@test.com",
-            password="testpass123",
-            company=self.company
+            company=cls.company
         )
-        self.document = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
+        cls.document = DocumentFactory(
+            company=cls.company,
+            entity=cls.entity,
             name="test.pdf",
-            mime_type="application/pdf",
-            size_bytes=1024,
-            bucket_key="test/test.pdf",
-            created_by=self.user
+            created_by=cls.user
         )
-        self.validation_flow = ValidationFlow.objects.create(
-            document=self.document
+        cls.validation_flow = ValidationFlow.objects.create(
+            document=cls.document
         )
-        self.validation_step = ValidationStep.objects.create(
-            validation_flow=self.validation_flow,
+        cls.validation_step = ValidationStep.objects.create(
+            validation_flow=cls.validation_flow,
             order=1,
-            approver=self.user
+            approver=cls.user
         )
     
     def test_validation_step_creation(self):
@@ -494,74 +413,57 @@ class ValidationStepModelTest(TestCase):
     
     def test_validation_step_status_methods(self):
         """Prueba los métodos de estado del paso."""
-        # Pendiente
-        self.assertTrue(self.validation_step.is_pending())
-        self.assertFalse(self.validation_step.is_approved())
-        self.assertFalse(self.validation_step.is_rejected())
-        
-        # Aprobado
-        self.validation_step.status = 'A'
-        self.validation_step.save()
-        self.assertFalse(self.validation_step.is_pending())
-        self.assertTrue(self.validation_step.is_approved())
-        self.assertFalse(self.validation_step.is_rejected())
-        
-        # Rechazado
-        self.validation_step.status = 'R'
-        self.validation_step.save()
-        self.assertFalse(self.validation_step.is_pending())
-        self.assertFalse(self.validation_step.is_approved())
-        self.assertTrue(self.validation_step.is_rejected())
+        # (estado, pendiente, aprobado, rechazado)
+        cases = [
+            ('P', True, False, False),   # Pendiente
+            ('A', False, True, False),   # Aprobado
+            ('R', False, False, True),   # Rechazado
+        ]
+        for step_status, pending, approved, rejected in cases:
+            with self.subTest(status=step_status):
+                self.validation_step.status = step_status
+                self.assertEqual(self.validation_step.is_pending(), pending)
+                self.assertEqual(self.validation_step.is_approved(), approved)
+                self.assertEqual(self.validation_step.is_rejected(), rejected)
 
 
 class ValidationActionModelTest(TestCase):
     """Pruebas para el modelo ValidationAction."""
     
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.company = Company.objects.create(
-            name="Empresa Test",
-            legal_name="Empresa Test S.A.S.",
-            tax_id="900123456-1",
-            email="test@empresa.com"
-        )
-        self.entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo"
-        )
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.company = CompanyFactory(name="Empresa Test", tax_id="900123456-1")
+        cls.entity_type = EntityTypeFactory()
+        cls.entity = EntityFactory(
+            company=cls.company,
+            entity_type=cls.entity_type,
             external_id="VEH001",
             name="Vehículo Test"
         )
-        self.user = User.objects.create_user(
+        cls.user = UserFactory(
             username="testuser",
             email="test@test.com",
-            password="testpass123",
-            company=self.company
+            company=cls.company
         )
-        self.document = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
+        cls.document = DocumentFactory(
+            company=cls.company,
+            entity=cls.entity,
             name="test.pdf",
-            mime_type="application/pdf",
-            size_bytes=1024,
-            bucket_key="test/test.pdf",
-            created_by=self.user
+            created_by=cls.user
         )
-        self.validation_flow = ValidationFlow.objects.create(
-            document=self.document
+        cls.validation_flow = ValidationFlow.objects.create(
+            document=cls.document
         )
-        self.validation_step = ValidationStep.objects.create(
-            validation_flow=self.validation_flow,
+        cls.validation_step = ValidationStep.objects.create(
+            validation_flow=cls.validation_flow,
             order=1,
-            approver=self.user
+            approver=cls.user
         )
-        self.validation_action = ValidationAction.objects.create(
-            document=self.document,
-            validation_step=self.validation_step,
-            actor=self.user,
+        cls.validation_action = ValidationAction.objects.create(
+            document=cls.document,
+            validation_step=cls.validation_step,
+            actor=cls.user,
             action='A',
             reason="Documento aprobado"
         )
@@ -585,8 +487,7 @@ class ValidationActionModelTest(TestCase):
         self.assertTrue(self.validation_action.is_approval())
         self.assertFalse(self.validation_action.is_rejection())
         
-        # Rechazo
+        # Rechazo (solo se cambia en memoria: los métodos leen el atributo)
         self.validation_action.action = 'R'
-        self.validation_action.save()
         self.assertFalse(self.validation_action.is_approval())
         self.assertTrue(self.validation_action.is_rejection())
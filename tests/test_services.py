@@ -3,17 +3,27 @@ Pruebas unitarias para los servicios del sistema ERP de gestión de documentos.
 
 Este módulo contiene las pruebas para los servicios de cloud storage
 y validación jerárquica.
+
+Las pruebas no escriben archivos ni usan S3 real, y el módulo no tiene estado
+mutable compartido: las clases se pueden ejecutar en procesos paralelos.
 """
 
+import io
 import uuid
-from unittest.mock import Mock, patch, MagicMock
-from django.test import TestCase
+from unittest.mock import patch
+from botocore.exceptions import ClientError
+from django.core import mail
+from django.test import TestCase, override_settings
 from django.core.exceptions import ValidationError
 
 from companies.models import Company, Entity, EntityType, User
 from documents.models import Document, ValidationFlow, ValidationStep, ValidationAction
 from documents.services import S3StorageService, CloudStorageService
 from documents.validation_service import ValidationService
+from documents.tasks import send_pending_approval_reminders
+
+# SHA-256 de b"test content"
+EXPECTED_HASH_TEST_CONTENT = "6ae8a75555209fd6c44157c0aed8016e763ff435a19cf186f76863140143ff72"
 
 
 class CloudStorageServiceTest(TestCase):
@@ -36,7 +46,7 @@ class CloudStorageServiceTest(TestCase):
         
         self.assertTrue(bucket_key.startswith(f"companies/{company_id}/{entity_type}/{entity_id}/docs/"))
         self.assertTrue(bucket_key.endswith(".pdf"))
-        self.assertIn(str(uuid.UUID(company_id)), bucket_key)
+        self.assertIn(company_id, bucket_key)
     
     def test_validate_file_valid(self):
         """Prueba la validación de archivos válidos."""
@@ -79,18 +89,35 @@ class CloudStorageServiceTest(TestCase):
         file_data = b"test content"
         hash_result = self.service.calculate_file_hash(file_data)
         
-        self.assertEqual(len(hash_result), 64)  # SHA-256 produce hash de 64 caracteres
-        self.assertIsInstance(hash_result, str)
+        self.assertEqual(hash_result, EXPECTED_HASH_TEST_CONTENT)
+        
+        # Un archivo abierto se lee por bloques y produce el mismo hash
+        self.assertEqual(
+            self.service.calculate_file_hash(io.BytesIO(file_data)),
+            EXPECTED_HASH_TEST_CONTENT
+        )
 
 
 class S3StorageServiceTest(TestCase):
     """Pruebas para el servicio de S3."""
     
+    @classmethod
+    def setUpClass(cls):
+        """
+        Parchea boto3.client una sola vez y comparte el servicio en la clase.
+        
+        El cliente de S3 es el mock devuelto por el patch; se reinicia antes
+        de cada prueba para que no se filtren llamadas ni valores de retorno.
+        """
+        super().setUpClass()
+        patcher = patch('documents.services.boto3.client')
+        cls.s3_client_mock = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        cls.service = S3StorageService()
+    
     def setUp(self):
         """Configuración inicial para las pruebas."""
-        with patch('documents.services.boto3.client'):
-            self.service = S3StorageService()
-            self.service.s3_client = Mock()
+        self.service.s3_client.reset_mock(return_value=True, side_effect=True)
     
     def test_generate_presigned_upload_url(self):
         """Prueba la generación de URLs pre-firmadas para subida."""
@@ -137,7 +164,6 @@ class S3StorageServiceTest(TestCase):
         """Prueba la verificación de existencia de archivos (no existe)."""
         bucket_key = "test/test.pdf"
         
-        from botocore.exceptions import ClientError
         self.service.s3_client.head_object.side_effect = ClientError(
             {'Error': {'Code': '404'}}, 'HeadObject'
         )
@@ -175,63 +201,83 @@ class S3StorageServiceTest(TestCase):
 
 
 class ValidationServiceTest(TestCase):
-    """Pruebas para el servicio de validación jerárquica."""
+    """
+    Pruebas para el servicio de validación jerárquica.
     
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.company = Company.objects.create(
+    Los bloques transaction.atomic() del servicio se ejecutan como savepoints
+    dentro de la transacción de cada prueba, así que TestCase basta: no hace
+    falta TransactionTestCase, que vacía las tablas después de cada prueba.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.company = Company.objects.create(
             name="Empresa Test",
             legal_name="Empresa Test S.A.S.",
             tax_id="900123456-1",
             email="test@empresa.com"
         )
-        self.entity_type = EntityType.objects.create(
+        cls.entity_type = EntityType.objects.create(
             name="vehicle",
             display_name="Vehículo"
         )
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
+        cls.entity = Entity.objects.create(
+            company=cls.company,
+            entity_type=cls.entity_type,
             external_id="VEH001",
             name="Vehículo Test"
         )
-        self.user1 = User.objects.create_user(
+        cls.user1 = User.objects.create_user(
             username="user1",
             email="user1@test.com",
             password="testpass123",
-            company=self.company
+            company=cls.company
         )
-        self.user2 = User.objects.create_user(
+        cls.user2 = User.objects.create_user(
             username="user2",
             email="user2@test.com",
             password="testpass123",
-            company=self.company
+            company=cls.company
         )
-        self.user3 = User.objects.create_user(
+        cls.user3 = User.objects.create_user(
             username="user3",
             email="user3@test.com",
             password="testpass123",
-            company=self.company
+            company=cls.company
         )
-        self.document = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
-            name="test.pdf",
+        cls.document = cls._make_document("test.pdf")
+        # Flujo de tres pasos (user1 < user2 < user3) que comparten varias pruebas
+        cls.three_steps_data = tuple(
+            {'order': order, 'approver_user_id': str(user.id)}
+            for order, user in enumerate((cls.user1, cls.user2, cls.user3), start=1)
+        )
+    
+    @classmethod
+    def _make_document(cls, name):
+        """
+        Crea un documento PDF de la entidad de prueba.
+        
+        Un documento solo admite un flujo de validación, así que las pruebas
+        que necesitan un segundo flujo crean un documento nuevo.
+        """
+        return Document.objects.create(
+            company=cls.company,
+            entity=cls.entity,
+            name=name,
             mime_type="application/pdf",
             size_bytes=1024,
-            bucket_key="test/test.pdf",
-            created_by=self.user1
+            bucket_key=f"test/{name}",
+            created_by=cls.user1
         )
     
+    def _create_three_step_flow(self):
+        """Crea sobre el documento el flujo de tres pasos compartido."""
+        return ValidationService.create_validation_flow(self.document, list(self.three_steps_data))
+    
     def test_create_validation_flow(self):
         """Prueba la creación de un flujo de validación."""
-        steps_data = [
-            {'order': 1, 'approver_user_id': str(self.user1.id)},
-            {'order': 2, 'approver_user_id': str(self.user2.id)},
-            {'order': 3, 'approver_user_id': str(self.user3.id)}
-        ]
-        
-        validation_flow = ValidationService.create_validation_flow(self.document, steps_data)
+        validation_flow = self._create_three_step_flow()
         
         self.assertEqual(validation_flow.document, self.document)
         self.assertTrue(validation_flow.is_active)
@@ -287,12 +333,7 @@ class ValidationServiceTest(TestCase):
     def test_approve_document_hierarchy(self):
         """Prueba la aprobación con regla de jerarquía."""
         # Crear flujo de validación
-        steps_data = [
-            {'order': 1, 'approver_user_id': str(self.user1.id)},
-            {'order': 2, 'approver_user_id': str(self.user2.id)},
-            {'order': 3, 'approver_user_id': str(self.user3.id)}
-        ]
-        validation_flow = ValidationService.create_validation_flow(self.document, steps_data)
+        validation_flow = self._create_three_step_flow()
         
         # Aprobar con usuario de mayor jerarquía (orden 3)
         action = ValidationService.approve_document(self.document, self.user3, "Aprobado")
@@ -313,12 +354,7 @@ class ValidationServiceTest(TestCase):
     def test_approve_document_intermediate_step(self):
         """Prueba la aprobación de un paso intermedio."""
         # Crear flujo de validación
-        steps_data = [
-            {'order': 1, 'approver_user_id': str(self.user1.id)},
-            {'order': 2, 'approver_user_id': str(self.user2.id)},
-            {'order': 3, 'approver_user_id': str(self.user3.id)}
-        ]
-        validation_flow = ValidationService.create_validation_flow(self.document, steps_data)
+        validation_flow = self._create_three_step_flow()
         
         # Aprobar con usuario de orden intermedio (orden 2)
         action = ValidationService.approve_document(self.document, self.user2, "Aprobado")
@@ -336,6 +372,23 @@ class ValidationServiceTest(TestCase):
         self.document.refresh_from_db()
         self.assertEqual(self.document.validation_status, 'P')
     
+    @override_settings(VALIDATION_CASCADE_AUDIT=True)
+    def test_approve_document_cascade_audit(self):
+        """Prueba el registro de acciones por pasos aprobados en cascada."""
+        self.user3.is_company_admin = True
+        self.user3.save()
+        self._create_three_step_flow()
+        
+        ValidationService.approve_document(self.document, self.user3, "Aprobado")
+        
+        actions = ValidationAction.objects.filter(document=self.document, actor=self.user3)
+        self.assertEqual(actions.count(), 3)
+        self.assertEqual(
+            sorted(actions.values_list('validation_step__order', flat=True)),
+            [1, 2, 3]
+        )
+        self.assertEqual(actions.filter(reason='auto-jerarquía').count(), 2)
+    
     def test_reject_document(self):
         """Prueba el rechazo de un documento."""
         # Crear flujo de validación
@@ -418,8 +471,11 @@ class ValidationServiceTest(TestCase):
         ]
         ValidationService.create_validation_flow(self.document, steps_data)
         
-        # Obtener documentos pendientes para user1
-        pending = ValidationService.get_pending_approvals_for_user(self.user1)
+        # Obtener documentos pendientes para user1: documentos con sus
+        # relaciones, pasos, aprobadores y sus empresas en un número fijo de
+        # consultas
+        with self.assertNumQueries(4):
+            pending = list(ValidationService.get_pending_approvals_for_user(self.user1))
         self.assertEqual(len(pending), 1)
         self.assertEqual(pending[0], self.document)
         
@@ -434,6 +490,9 @@ class ValidationServiceTest(TestCase):
     
     def test_get_user_approval_stats(self):
         """Prueba la obtención de estadísticas de aprobación de un usuario."""
+        self.user1.is_company_admin = True
+        self.user1.save()
+        
         # Crear flujo de validación
         steps_data = [
             {'order': 1, 'approver_user_id': str(self.user1.id)}
@@ -450,23 +509,79 @@ class ValidationServiceTest(TestCase):
         self.assertEqual(stats['total_actions'], 1)
         
         # Crear otro documento y rechazarlo
-        document2 = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
-            name="test2.pdf",
-            mime_type="application/pdf",
-            size_bytes=1024,
-            bucket_key="test/test2.pdf",
-            created_by=self.user1
-        )
+        document2 = self._make_document("test2.pdf")
         steps_data2 = [
             {'order': 1, 'approver_user_id': str(self.user1.id)}
         ]
         ValidationService.create_validation_flow(document2, steps_data2)
         ValidationService.reject_document(document2, self.user1, "Rechazado")
         
-        # Obtener estadísticas actualizadas
-        stats = ValidationService.get_user_approval_stats(self.user1)
+        # Obtener estadísticas actualizadas: aprobadas y rechazadas se cuentan
+        # en una sola consulta, más el conteo de pendientes
+        with self.assertNumQueries(2):
+            stats = ValidationService.get_user_approval_stats(self.user1)
         self.assertEqual(stats['approved'], 1)
         self.assertEqual(stats['rejected'], 1)
         self.assertEqual(stats['total_actions'], 2)
+
+
+class PendingApprovalRemindersTest(TestCase):
+    """Pruebas para la tarea de recordatorios de aprobación."""
+    
+    def setUp(self):
+        """Configuración inicial para las pruebas."""
+        self.company = Company.objects.create(
+            name="Empresa Test",
+            legal_name="Empresa Test S.A.S.",
+            tax_id="900123456-1",
+            email="test@empresa.com"
+        )
+        self.entity_type = EntityType.objects.create(
+            name="vehicle",
+            display_name="Vehículo"
+        )
+        self.entity = Entity.objects.create(
+            company=self.company,
+            entity_type=self.entity_type,
+            external_id="VEH001",
+            name="Vehículo Test"
+        )
+        self.user1 = User.objects.create_user(
+            username="user1",
+            email="user1@test.com",
+            password="testpass123",
+            company=self.company
+        )
+        self.user2 = User.objects.create_user(
+            username="user2",
+            email="user2@test.com",
+            password="testpass123",
+            company=self.company
+        )
+        for i in range(3):
+            document = Document.objects.create(
+                company=self.company,
+                entity=self.entity,
+                name=f"test{i}.pdf",
+                mime_type="application/pdf",
+                size_bytes=1024,
+                bucket_key=f"test/test{i}.pdf",
+                created_by=self.user1
+            )
+            ValidationService.create_validation_flow(document, [
+                {'order': 1, 'approver_user_id': str(self.user1.id)},
+                {'order': 2, 'approver_user_id': str(self.user2.id)}
+            ])
+    
+    def test_one_reminder_per_approver(self):
+        """Prueba que cada aprobador recibe un único recordatorio."""
+        sent = send_pending_approval_reminders(chunk_size=2)
+        
+        self.assertEqual(sent, 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ["user1@test.com", "user2@test.com"]
+        )
+        for message in mail.outbox:
+            self.assertEqual(len(message.body.splitlines()), 3)
@@ -6,59 +6,35 @@ usando el servicio mock para evitar dependencias externas.
 """
 
 import json
+import uuid
 from unittest.mock import patch, Mock
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.core.exceptions import ValidationError
 
 from companies.models import Company, Entity, EntityType, User
 from documents.models import Document, ValidationFlow, ValidationStep, ValidationAction
 from documents.services_test import MockCloudStorageService
 from documents.validation_service import ValidationService
+from tests.factories import UserFactory
 
 
-class MockCloudStorageServiceTest(TestCase):
-    """Pruebas para el servicio mock de cloud storage."""
+class MockCloudStorageServiceTest(SimpleTestCase):
+    """
+    Pruebas para el servicio mock de cloud storage.
+    
+    El servicio solo guarda metadatos en memoria y no consulta la base de
+    datos, así que las pruebas no necesitan transacción ni fixtures.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """La configuración del servicio se lee una sola vez por clase."""
+        super().setUpClass()
+        cls.service = MockCloudStorageService()
 
     def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.service = MockCloudStorageService()
-        
-        # Crear datos de prueba
-        self.company = Company.objects.create(
-            name='Empresa Test',
-            legal_name='Empresa Test S.A.S.',
-            tax_id='900123456-1',
-            email='test@empresa.com',
-            phone='+57-1-234-5678',
-            address='Calle 123 #45-67'
-        )
-        
-        self.entity_type = EntityType.objects.create(
-            name='vehicle',
-            display_name='Vehículo',
-            description='Vehículos de la empresa',
-            is_active=True
-        )
-        
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
-            external_id='VEH001',
-            name='Vehículo Test',
-            metadata='{"modelo": "Toyota Corolla"}',
-            is_active=True
-        )
-        
-        self.user = User.objects.create_user(
-            username='testuser',
-            email='test@test.com',
-            password='testpass123',
-            company=self.company,
-            employee_id='EMP001',
-            phone='+57-1-234-5679',
-            position='Desarrollador',
-            department='Tecnología'
-        )
+        """Cada prueba parte de un almacenamiento en memoria vacío."""
+        self.service._storage.clear()
 
     def test_service_initialization(self):
         """Prueba la inicialización del servicio mock."""
@@ -68,39 +44,37 @@ class MockCloudStorageServiceTest(TestCase):
         self.assertIsNotNone(self.service.allowed_mime_types)
         self.assertIsInstance(self.service._storage, dict)
 
-    def test_validate_file_valid(self):
-        """Prueba la validación de archivos válidos."""
-        # Archivo válido
-        self.service.validate_file('application/pdf', 1024)
-        self.service.validate_file('image/jpeg', 2048)
-        self.service.validate_file('image/png', 512)
-
-    def test_validate_file_invalid_mime_type(self):
-        """Prueba la validación con tipo MIME inválido."""
-        with self.assertRaises(ValidationError):
-            self.service.validate_file('application/x-executable', 1024)
-
-    def test_validate_file_too_large(self):
-        """Prueba la validación con archivo demasiado grande."""
-        with self.assertRaises(ValidationError):
-            self.service.validate_file('application/pdf', 20000000)  # 20MB
-
-    def test_validate_file_zero_size(self):
-        """Prueba la validación con tamaño cero."""
-        with self.assertRaises(ValidationError):
-            self.service.validate_file('application/pdf', 0)
+    def test_validate_file(self):
+        """Prueba la validación de tipo MIME y tamaño de archivos."""
+        # (tipo MIME, tamaño, es válido)
+        cases = [
+            ('application/pdf', 1024, True),
+            ('image/jpeg', 2048, True),
+            ('image/png', 512, True),
+            ('application/x-executable', 1024, False),  # Tipo MIME inválido
+            ('application/pdf', 20000000, False),        # 20MB: demasiado grande
+            ('application/pdf', 0, False),               # Tamaño cero
+        ]
+        for mime_type, size_bytes, valid in cases:
+            with self.subTest(mime_type=mime_type, size_bytes=size_bytes):
+                if valid:
+                    self.service.validate_file(mime_type, size_bytes)
+                else:
+                    with self.assertRaises(ValidationError):
+                        self.service.validate_file(mime_type, size_bytes)
 
     def test_generate_bucket_key(self):
         """Prueba la generación de claves de bucket."""
+        company_id = str(uuid.uuid4())
         key = self.service.generate_bucket_key(
-            str(self.company.id),
+            company_id,
             'vehicle',
             'VEH001',
             'test.pdf'
         )
         
         self.assertIn('companies', key)
-        self.assertIn(str(self.company.id), key)
+        self.assertIn(company_id, key)
         self.assertIn('vehicle', key)
         self.assertIn('VEH001', key)
         self.assertIn('test.pdf', key)
@@ -185,9 +159,10 @@ class MockCloudStorageServiceTest(TestCase):
 class ValidationServiceTest(TestCase):
     """Pruebas para el servicio de validación jerárquica."""
 
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.company = Company.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.company = Company.objects.create(
             name='Empresa Test',
             legal_name='Empresa Test S.A.S.',
             tax_id='900123456-2',
@@ -196,55 +171,58 @@ class ValidationServiceTest(TestCase):
             address='Calle 123 #45-67'
         )
         
-        self.entity_type = EntityType.objects.create(
+        cls.entity_type = EntityType.objects.create(
             name='vehicle',
             display_name='Vehículo',
             description='Vehículos de la empresa',
             is_active=True
         )
         
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
+        cls.entity = Entity.objects.create(
+            company=cls.company,
+            entity_type=cls.entity_type,
             external_id='VEH002',
             name='Vehículo Test',
-            metadata='{"modelo": "Toyota Corolla"}',
+            metadata={'modelo': 'Toyota Corolla'},
             is_active=True
         )
         
-        self.user1 = User.objects.create_user(
-            username='approver1',
-            email='approver1@test.com',
-            password='testpass123',
-            company=self.company,
-            employee_id='EMP001',
-            phone='+57-1-234-5679',
-            position='Aprobador',
-            department='Recursos Humanos'
-        )
-        
-        self.user2 = User.objects.create_user(
-            username='approver2',
-            email='approver2@test.com',
-            password='testpass123',
-            company=self.company,
-            employee_id='EMP002',
-            phone='+57-1-234-5680',
-            position='Gerente',
-            department='Administración'
-        )
-        
-        self.document = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
+        # Los dos aprobadores se insertan en una sola consulta; son
+        # administradores de la empresa para poder aprobar y rechazar
+        cls.user1, cls.user2 = User.objects.bulk_create([
+            UserFactory.build(
+                username='approver1',
+                email='approver1@test.com',
+                company=cls.company,
+                employee_id='EMP001',
+                phone='+57-1-234-5679',
+                position='Aprobador',
+                department='Recursos Humanos',
+                is_company_admin=True
+            ),
+            UserFactory.build(
+                username='approver2',
+                email='approver2@test.com',
+                company=cls.company,
+                employee_id='EMP002',
+                phone='+57-1-234-5680',
+                position='Gerente',
+                department='Administración',
+                is_company_admin=True
+            ),
+        ])
+        
+        cls.document = Document.objects.create(
+            company=cls.company,
+            entity=cls.entity,
             name='test_document.pdf',
             mime_type='application/pdf',
             size_bytes=1024,
             bucket_key='test/test_document.pdf',
             file_hash='test_hash',
             description='Documento de prueba',
-            tags='["test", "documento"]',
-            created_by=self.user1
+            tags=['test', 'documento'],
+            created_by=cls.user1
         )
 
     def test_create_validation_flow(self):
@@ -254,18 +232,22 @@ class ValidationServiceTest(TestCase):
             {'order': 2, 'approver_user_id': str(self.user2.id)}
         ]
         
-        validation_flow = ValidationService.create_validation_flow(
-            self.document, approvers
-        )
+        # Consultas: aprobadores (1), savepoint (2), flujo (1), pasos en un
+        # solo INSERT (1) y documento (1)
+        with self.assertNumQueries(6):
+            validation_flow = ValidationService.create_validation_flow(
+                self.document, approvers
+            )
         
         self.assertIsNotNone(validation_flow)
         self.assertEqual(validation_flow.document, self.document)
         self.assertTrue(validation_flow.is_active)
-        self.assertEqual(validation_flow.steps.count(), 2)
         
-        # Verificar pasos
-        step1 = validation_flow.steps.get(order=1)
-        step2 = validation_flow.steps.get(order=2)
+        # Verificar pasos (con sus aprobadores, en una sola consulta)
+        with self.assertNumQueries(1):
+            steps = list(validation_flow.get_steps())
+        self.assertEqual(len(steps), 2)
+        step1, step2 = steps
         
         self.assertEqual(step1.approver, self.user1)
         self.assertEqual(step2.approver, self.user2)
@@ -285,15 +267,18 @@ class ValidationServiceTest(TestCase):
         )
         
         # Aprobar paso 2 (mayor jerarquía)
-        result = ValidationService.approve_document(
-            self.document, self.user2, "Documento aprobado por gerencia"
-        )
+        # Consultas: permiso (1), savepoint (2), pasos del flujo (1), paso del
+        # actor (1), acción (1), cascada en un solo UPDATE (1) y documento (1)
+        with self.assertNumQueries(8):
+            result = ValidationService.approve_document(
+                self.document, self.user2, "Documento aprobado por gerencia"
+            )
         
         self.assertTrue(result)
         
         # Verificar que ambos pasos fueron aprobados
-        step1 = validation_flow.steps.get(order=1)
-        step2 = validation_flow.steps.get(order=2)
+        with self.assertNumQueries(1):
+            step1, step2 = validation_flow.get_steps()
         
         self.assertEqual(step1.status, 'A')
         self.assertEqual(step2.status, 'A')
@@ -319,24 +304,26 @@ class ValidationServiceTest(TestCase):
             {'order': 2, 'approver_user_id': str(self.user2.id)}
         ]
         
-        validation_flow = ValidationService.create_validation_flow(
-            self.document, approvers
-        )
+        ValidationService.create_validation_flow(self.document, approvers)
         
         # Rechazar documento
-        result = ValidationService.reject_document(
-            self.document, self.user1, "Documento no cumple requisitos"
-        )
+        # Consultas: permiso (1), savepoint (2), paso del actor (1) y su
+        # actualización (1), acción (1), documento (1) y flujo (1)
+        with self.assertNumQueries(8):
+            result = ValidationService.reject_document(
+                self.document, self.user1, "Documento no cumple requisitos"
+            )
         
         self.assertTrue(result)
         
-        # Verificar que el documento está rechazado
-        self.document.refresh_from_db()
-        self.assertEqual(self.document.validation_status, 'R')
-        
-        # Verificar que el flujo está desactivado
-        validation_flow.refresh_from_db()
-        self.assertFalse(validation_flow.is_active)
+        # Verificar en una sola consulta que el documento está rechazado y
+        # que el flujo quedó desactivado
+        with self.assertNumQueries(1):
+            document_state = Document.objects.filter(pk=self.document.pk).values(
+                'validation_status', 'validation_flow__is_active'
+            ).get()
+        self.assertEqual(document_state['validation_status'], 'R')
+        self.assertFalse(document_state['validation_flow__is_active'])
         
         # Verificar que se creó la acción de rechazo
         action = ValidationAction.objects.filter(
@@ -357,21 +344,20 @@ class ValidationServiceTest(TestCase):
         
         ValidationService.create_validation_flow(self.document, approvers)
         
+        unauthorized = UserFactory(
+            username='unauthorized',
+            email='unauthorized@test.com',
+            company=self.company,
+            employee_id='EMP003',
+            phone='+57-1-234-5681',
+            position='Empleado',
+            department='Ventas'
+        )
+        
         # Intentar aprobar con usuario no autorizado
         with self.assertRaises(ValidationError):
             ValidationService.approve_document(
-                self.document, 
-                User.objects.create_user(
-                    username='unauthorized',
-                    email='unauthorized@test.com',
-                    password='testpass123',
-                    company=self.company,
-                    employee_id='EMP003',
-                    phone='+57-1-234-5681',
-                    position='Empleado',
-                    department='Ventas'
-                ),
-                "Intento no autorizado"
+                self.document, unauthorized, "Intento no autorizado"
             )
 
     def test_approve_document_already_rejected(self):
@@ -0,0 +1,66 @@
+"""
+Pruebas unitarias del serializer de URLs de subida.
+
+Validan las reglas de DocumentUploadSerializer directamente, sin pasar por
+la pila HTTP ni por la base de datos: la búsqueda de la empresa se simula.
+"""
+
+import uuid
+from unittest.mock import patch, Mock
+from django.test import SimpleTestCase
+
+from companies.models import Company
+from documents.serializers import DocumentUploadSerializer
+
+
+@patch('documents.serializers.Company.objects.get', return_value=Mock())
+class DocumentUploadSerializerTest(SimpleTestCase):
+    """Pruebas de validación de DocumentUploadSerializer."""
+
+    def upload_data(self, **overrides):
+        """Datos válidos de subida, con los campos indicados reemplazados."""
+        data = {
+            "company_id": str(uuid.uuid4()),
+            "entity_type": "vehicle",
+            "entity_id": "VEH001",
+            "filename": "test.pdf",
+            "mime_type": "application/pdf",
+            "size_bytes": 1024
+        }
+        data.update(overrides)
+        return data
+
+    def test_valid_data(self, mock_get):
+        """Prueba que los datos válidos pasan la validación."""
+        serializer = DocumentUploadSerializer(data=self.upload_data())
+
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_invalid_mime_type(self, mock_get):
+        """Prueba el rechazo de un tipo MIME no permitido."""
+        serializer = DocumentUploadSerializer(data=self.upload_data(
+            filename="virus.exe",
+            mime_type="application/x-executable"
+        ))
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('mime_type', serializer.errors)
+
+    def test_file_too_large(self, mock_get):
+        """Prueba el rechazo de un archivo que excede el tamaño máximo."""
+        serializer = DocumentUploadSerializer(data=self.upload_data(
+            filename="huge.pdf",
+            size_bytes=50000000  # 50MB
+        ))
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('size_bytes', serializer.errors)
+
+    def test_nonexistent_company(self, mock_get):
+        """Prueba el rechazo de una empresa inexistente o inactiva."""
+        mock_get.side_effect = Company.DoesNotExist
+
+        serializer = DocumentUploadSerializer(data=self.upload_data())
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('company_id', serializer.errors)
@@ -3,237 +3,259 @@ Pruebas unitarias para las vistas y API del sistema ERP de gestión de documento
 
 Este módulo contiene las pruebas para las vistas de Django REST Framework
 y los endpoints de la API.
+
+Cada clase crea sus datos en setUpTestData y el almacenamiento se simula con
+un servicio falso por clase, sin estado de módulo compartido: con
+`--dist=loadscope` las clases se reparten entre procesos de pytest-xdist,
+cada uno con su propia base de datos.
 """
 
-import json
+import copy
 import uuid
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 from django.test import TestCase
 from django.urls import reverse
-from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework import status
 
-from companies.models import Company, Entity, EntityType, User
+from companies.models import Company, Entity, EntityType
 from documents.models import Document, ValidationFlow, ValidationStep, ValidationAction
+from tests.factories import UserFactory, bulk_create_steps
+
 
-User = get_user_model()
+class FakeStorageService:
+    """
+    Servicio de storage mínimo para las vistas.
+    
+    Devuelve respuestas fijas sin la maquinaria de MagicMock; cada prueba
+    solo ajusta `file_present` o revisa `deleted_keys`.
+    """
+    
+    expiration = 3600
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Vuelve al estado inicial: el archivo existe y no se borró nada."""
+        self.file_present = True
+        self.deleted_keys = []
+    
+    def generate_bucket_key(self, company_id, entity_type, entity_id, filename):
+        return f"{company_id}/{entity_type}/{entity_id}/{filename}"
+    
+    def generate_presigned_upload_url(self, bucket_key, mime_type):
+        return {
+            'url': 'https://test-bucket.s3.amazonaws.com/',
+            'fields': {'key': bucket_key, 'Content-Type': mime_type}
+        }
+    
+    def file_exists(self, bucket_key):
+        return self.file_present
+    
+    def generate_presigned_download_url(self, bucket_key):
+        return f"https://test-bucket.s3.amazonaws.com/{bucket_key}"
+    
+    def delete_file(self, bucket_key):
+        self.deleted_keys.append(bucket_key)
+        return True
 
 
 class DocumentAPITest(APITestCase):
     """Pruebas para la API de documentos."""
     
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.company = Company.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.company = Company.objects.create(
             name="Empresa Test",
             legal_name="Empresa Test S.A.S.",
             tax_id="900123456-1",
             email="test@empresa.com"
         )
-        self.entity_type = EntityType.objects.create(
+        cls.entity_type = EntityType.objects.create(
             name="vehicle",
             display_name="Vehículo"
         )
-        self.entity = Entity.objects.create(
-            company=self.company,
-            entity_type=self.entity_type,
+        cls.entity = Entity.objects.create(
+            company=cls.company,
+            entity_type=cls.entity_type,
             external_id="VEH001",
             name="Vehículo Test"
         )
-        self.user = User.objects.create_user(
+        cls.user = UserFactory(
             username="testuser",
             email="test@test.com",
-            password="testpass123",
-            company=self.company
+            company=cls.company
         )
-        self.approver = User.objects.create_user(
+        cls.approver = UserFactory(
             username="approver",
             email="approver@test.com",
-            password="testpass123",
-            company=self.company,
+            company=cls.company,
             is_company_admin=True
         )
-        self.document = Document.objects.create(
-            company=self.company,
-            entity=self.entity,
+        cls.document = Document.objects.create(
+            company=cls.company,
+            entity=cls.entity,
             name="test.pdf",
             mime_type="application/pdf",
             size_bytes=1024,
             bucket_key="test/test.pdf",
-            created_by=self.user
+            created_by=cls.user
         )
-    
-    def test_create_document_without_validation(self):
-        """Prueba la creación de un documento sin flujo de validación."""
-        self.client.force_authenticate(user=self.user)
-        
-        data = {
-            "company_id": str(self.company.id),
+        # Payload base de creación; cada prueba parte de una copia y cambia
+        # solo lo que necesita
+        cls.create_payload = {
+            "company_id": str(cls.company.id),
             "entity": {
                 "entity_type": "vehicle",
                 "entity_id": "VEH001"
             },
             "document": {
-                "name": "nuevo.pdf",
+                "name": "test.pdf",
                 "mime_type": "application/pdf",
-                "size_bytes": 2048,
-                "bucket_key": "test/nuevo.pdf",
-                "description": "Documento de prueba"
+                "size_bytes": 1024,
+                "bucket_key": "test/test.pdf"
             }
         }
+    
+    @classmethod
+    def setUpClass(cls):
+        """
+        Parchea el servicio de storage una sola vez para toda la clase.
+        
+        Se parchea el nombre que usan las vistas (documents.views), que es
+        donde se resuelve en cada petición.
+        """
+        super().setUpClass()
+        cls.storage = FakeStorageService()
+        patcher = patch('documents.views.storage_service', cls.storage)
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+    
+    def setUp(self):
+        """Reinicia el storage para que no se filtre estado entre pruebas."""
+        self.storage.reset()
+        # Usuario por defecto; las pruebas que actúan como otro usuario
+        # vuelven a llamar a force_authenticate
+        self.client.force_authenticate(user=self.user)
+    
+    def _create_payload(self, **document_fields):
+        """
+        Retorna una copia del payload base de creación de documentos.
+
+        Args:
+            **document_fields: Campos de "document" que se sobrescriben
+
+        Returns:
+            Diccionario listo para modificar y enviar con _post_document
+        """
+        payload = copy.deepcopy(self.create_payload)
+        payload["document"].update(document_fields)
+        return payload
+    
+    def _post_document(self, payload):
+        """Envía el payload al endpoint de creación como JSON."""
+        return self.client.post('/api/documents/', payload, format='json')
+    
+    def _setup_pending_validation(self, document=None):
+        """
+        Deja un documento pendiente con un flujo de un paso para el aprobador.
+
+        Args:
+            document: Documento a validar (por defecto self.document)
+
+        Returns:
+            Tupla (flujo de validación, paso único del flujo)
+        """
+        document = document or self.document
+        validation_flow = ValidationFlow.objects.create(document=document)
+        step, = bulk_create_steps(validation_flow, [self.approver])
+        # update() escribe solo la columna de estado, sin reescribir la fila
+        Document.objects.filter(pk=document.pk).update(validation_status='P')
+        document.refresh_from_db(fields=['validation_status'])
+        return validation_flow, step
+    
+    def test_create_document_without_validation(self):
+        """Prueba la creación de un documento sin flujo de validación."""
+        payload = self._create_payload(
+            name="nuevo.pdf",
+            size_bytes=2048,
+            bucket_key="test/nuevo.pdf",
+            description="Documento de prueba"
+        )
         
-        response = self.client.post('/api/documents/', data, format='json')
+        response = self._post_document(payload)
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Document.objects.count(), 2)
         
-        new_document = Document.objects.get(name="nuevo.pdf")
-        self.assertEqual(new_document.company, self.company)
-        self.assertEqual(new_document.entity, self.entity)
-        self.assertEqual(new_document.description, "Documento de prueba")
-        self.assertIsNone(new_document.validation_status)
+        # Solo las columnas verificadas, sin cargar las relaciones
+        new_document = Document.objects.filter(name="nuevo.pdf").values(
+            'company_id', 'entity_id', 'description', 'validation_status'
+        ).get()
+        self.assertEqual(new_document['company_id'], self.company.id)
+        self.assertEqual(new_document['entity_id'], self.entity.id)
+        self.assertEqual(new_document['description'], "Documento de prueba")
+        self.assertIsNone(new_document['validation_status'])
     
     def test_create_document_with_validation(self):
         """Prueba la creación de un documento con flujo de validación."""
-        self.client.force_authenticate(user=self.user)
-        
-        data = {
-            "company_id": str(self.company.id),
-            "entity": {
-                "entity_type": "vehicle",
-                "entity_id": "VEH001"
-            },
-            "document": {
-                "name": "validacion.pdf",
-                "mime_type": "application/pdf",
-                "size_bytes": 2048,
-                "bucket_key": "test/validacion.pdf"
-            },
-            "validation_flow": {
-                "enabled": True,
-                "steps": [
-                    {"order": 1, "approver_user_id": str(self.approver.id)}
-                ]
-            }
+        payload = self._create_payload(
+            name="validacion.pdf",
+            size_bytes=2048,
+            bucket_key="test/validacion.pdf"
+        )
+        payload["validation_flow"] = {
+            "enabled": True,
+            "steps": [
+                {"order": 1, "approver_user_id": str(self.approver.id)}
+            ]
         }
         
-        response = self.client.post('/api/documents/', data, format='json')
+        response = self._post_document(payload)
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         
-        new_document = Document.objects.get(name="validacion.pdf")
-        self.assertEqual(new_document.validation_status, 'P')
+        new_document = Document.objects.filter(name="validacion.pdf").values(
+            'id', 'validation_status'
+        ).get()
+        self.assertEqual(new_document['validation_status'], 'P')
         
         # Verificar que se creó el flujo de validación
-        validation_flow = new_document.validation_flow
-        self.assertTrue(validation_flow.is_active)
-        self.assertEqual(validation_flow.steps.count(), 1)
-        self.assertEqual(validation_flow.steps.first().approver, self.approver)
-    
-    def test_create_document_invalid_company(self):
-        """Prueba la creación de un documento con empresa inválida."""
-        self.client.force_authenticate(user=self.user)
-        
-        data = {
-            "company_id": str(uuid.uuid4()),  # ID inexistente
-            "entity": {
-                "entity_type": "vehicle",
-                "entity_id": "VEH001"
-            },
-            "document": {
-                "name": "test.pdf",
-                "mime_type": "application/pdf",
-                "size_bytes": 1024,
-                "bucket_key": "test/test.pdf"
-            }
-        }
-        
-        response = self.client.post('/api/documents/', data, format='json')
-        
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('error', response.data)
-    
-    def test_create_document_invalid_entity(self):
-        """Prueba la creación de un documento con entidad inválida."""
-        self.client.force_authenticate(user=self.user)
-        
-        data = {
-            "company_id": str(self.company.id),
-            "entity": {
-                "entity_type": "invalid_type",
-                "entity_id": "INV001"
-            },
-            "document": {
-                "name": "test.pdf",
-                "mime_type": "application/pdf",
-                "size_bytes": 1024,
-                "bucket_key": "test/test.pdf"
-            }
-        }
-        
-        response = self.client.post('/api/documents/', data, format='json')
-        
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('error', response.data)
-    
-    def test_create_document_invalid_mime_type(self):
-        """Prueba la creación de un documento con tipo MIME inválido."""
-        self.client.force_authenticate(user=self.user)
-        
-        data = {
-            "company_id": str(self.company.id),
-            "entity": {
-                "entity_type": "vehicle",
-                "entity_id": "VEH001"
-            },
-            "document": {
-                "name": "test.txt",
-                "mime_type": "text/plain",  # Tipo no permitido
-                "size_bytes": 1024,
-                "bucket_key": "test/test.txt"
-            }
-        }
-        
-        response = self.client.post('/api/documents/', data, format='json')
-        
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('error', response.data)
+        self.assertTrue(
+            ValidationFlow.objects.filter(document_id=new_document['id']).values_list(
+                'is_active', flat=True
+            ).get()
+        )
+        approver_ids = list(
+            ValidationStep.objects.filter(
+                validation_flow__document_id=new_document['id']
+            ).values_list('approver_id', flat=True)
+        )
+        self.assertEqual(approver_ids, [self.approver.id])
     
-    def test_create_document_too_large(self):
-        """Prueba la creación de un documento demasiado grande."""
-        self.client.force_authenticate(user=self.user)
-        
-        data = {
-            "company_id": str(self.company.id),
-            "entity": {
-                "entity_type": "vehicle",
-                "entity_id": "VEH001"
-            },
-            "document": {
-                "name": "large.pdf",
-                "mime_type": "application/pdf",
-                "size_bytes": 20000000,  # 20MB
-                "bucket_key": "test/large.pdf"
-            }
-        }
-        
-        response = self.client.post('/api/documents/', data, format='json')
-        
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('error', response.data)
+    def test_create_document_invalid(self):
+        """Prueba que la creación con datos inválidos responde 400."""
+        # (caso, campos de primer nivel, campos de "document", campo con error)
+        cases = [
+            ('empresa inexistente', {"company_id": str(uuid.uuid4())}, {}, 'company_id'),
+            ('entidad inválida', {"entity": {"entity_type": "invalid_type", "entity_id": "INV001"}}, {}, 'entity'),
+            ('tipo MIME no permitido', {}, {"name": "test.txt", "mime_type": "text/plain", "bucket_key": "test/test.txt"}, 'document'),
+            ('archivo de 20MB', {}, {"name": "large.pdf", "size_bytes": 20000000, "bucket_key": "test/large.pdf"}, 'document'),
+        ]
+        for case, fields, document_fields, error_field in cases:
+            with self.subTest(case=case):
+                payload = self._create_payload(**document_fields)
+                payload.update(fields)
+                
+                response = self._post_document(payload)
+                
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(error_field, response.data)
     
-    @patch('documents.services.storage_service')
-    def test_upload_url_generation(self, mock_storage):
+    def test_upload_url_generation(self):
         """Prueba la generación de URLs pre-firmadas para subida."""
-        self.client.force_authenticate(user=self.user)
-        
-        # Mock de la respuesta del servicio de storage
-        mock_storage.generate_presigned_upload_url.return_value = {
-            'url': 'https://test-bucket.s3.amazonaws.com/',
-            'fields': {'Content-Type': 'application/pdf'}
-        }
-        
         data = {
             "company_id": str(self.company.id),
             "entity_type": "vehicle",
@@ -250,15 +272,8 @@ class DocumentAPITest(APITestCase):
         self.assertIn('bucket_key', response.data)
         self.assertIn('fields', response.data)
     
-    @patch('documents.services.storage_service')
-    def test_download_url_generation(self, mock_storage):
+    def test_download_url_generation(self):
         """Prueba la generación de URLs pre-firmadas para descarga."""
-        self.client.force_authenticate(user=self.user)
-        
-        # Mock de la respuesta del servicio de storage
-        mock_storage.file_exists.return_value = True
-        mock_storage.generate_presigned_download_url.return_value = 'https://test-bucket.s3.amazonaws.com/test/test.pdf'
-        
         response = self.client.get(f'/api/documents/{self.document.id}/download/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -266,13 +281,10 @@ class DocumentAPITest(APITestCase):
         self.assertEqual(response.data['filename'], 'test.pdf')
         self.assertEqual(response.data['mime_type'], 'application/pdf')
     
-    @patch('documents.services.storage_service')
-    def test_download_file_not_found(self, mock_storage):
+    def test_download_file_not_found(self):
         """Prueba la descarga de un archivo que no existe en el bucket."""
-        self.client.force_authenticate(user=self.user)
-        
-        # Mock de archivo no encontrado
-        mock_storage.file_exists.return_value = False
+        # Archivo no encontrado en el bucket
+        self.storage.file_present = False
         
         response = self.client.get(f'/api/documents/{self.document.id}/download/')
         
@@ -281,15 +293,7 @@ class DocumentAPITest(APITestCase):
     
     def test_approve_document(self):
         """Prueba la aprobación de un documento."""
-        # Crear flujo de validación
-        validation_flow = ValidationFlow.objects.create(document=self.document)
-        ValidationStep.objects.create(
-            validation_flow=validation_flow,
-            order=1,
-            approver=self.approver
-        )
-        self.document.validation_status = 'P'
-        self.document.save()
+        self._setup_pending_validation()
         
         self.client.force_authenticate(user=self.approver)
         
@@ -305,7 +309,7 @@ class DocumentAPITest(APITestCase):
         self.assertIn('document', response.data)
         
         # Verificar que el documento fue aprobado
-        self.document.refresh_from_db()
+        self.document.refresh_from_db(fields=['validation_status'])
         self.assertEqual(self.document.validation_status, 'A')
         
         # Verificar que se creó la acción de validación
@@ -316,15 +320,7 @@ class DocumentAPITest(APITestCase):
     
     def test_reject_document(self):
         """Prueba el rechazo de un documento."""
-        # Crear flujo de validación
-        validation_flow = ValidationFlow.objects.create(document=self.document)
-        ValidationStep.objects.create(
-            validation_flow=validation_flow,
-            order=1,
-            approver=self.approver
-        )
-        self.document.validation_status = 'P'
-        self.document.save()
+        validation_flow, _ = self._setup_pending_validation()
         
         self.client.force_authenticate(user=self.approver)
         
@@ -340,24 +336,16 @@ class DocumentAPITest(APITestCase):
         self.assertIn('document', response.data)
         
         # Verificar que el documento fue rechazado
-        self.document.refresh_from_db()
+        self.document.refresh_from_db(fields=['validation_status'])
         self.assertEqual(self.document.validation_status, 'R')
         
         # Verificar que el flujo fue desactivado
-        validation_flow.refresh_from_db()
+        validation_flow.refresh_from_db(fields=['is_active'])
         self.assertFalse(validation_flow.is_active)
     
     def test_approve_document_no_permission(self):
         """Prueba la aprobación sin permisos."""
-        # Crear flujo de validación
-        validation_flow = ValidationFlow.objects.create(document=self.document)
-        ValidationStep.objects.create(
-            validation_flow=validation_flow,
-            order=1,
-            approver=self.approver
-        )
-        self.document.validation_status = 'P'
-        self.document.save()
+        self._setup_pending_validation()
         
         # Autenticar con usuario que no es aprobador
         self.client.force_authenticate(user=self.user)
@@ -374,19 +362,10 @@ class DocumentAPITest(APITestCase):
     
     def test_get_validation_status(self):
         """Prueba la obtención del estado de validación."""
-        # Crear flujo de validación
-        validation_flow = ValidationFlow.objects.create(document=self.document)
-        ValidationStep.objects.create(
-            validation_flow=validation_flow,
-            order=1,
-            approver=self.approver
-        )
-        self.document.validation_status = 'P'
-        self.document.save()
-        
-        self.client.force_authenticate(user=self.user)
+        self._setup_pending_validation()
         
-        response = self.client.get(f'/api/documents/{self.document.id}/validation_status/')
+        with self.assertNumQueries(5):
+            response = self.client.get(f'/api/documents/{self.document.id}/validation_status/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(response.data['has_validation'])
@@ -396,39 +375,43 @@ class DocumentAPITest(APITestCase):
     
     def test_get_pending_approvals(self):
         """Prueba la obtención de documentos pendientes de aprobación."""
-        # Crear flujo de validación
-        validation_flow = ValidationFlow.objects.create(document=self.document)
-        ValidationStep.objects.create(
-            validation_flow=validation_flow,
-            order=1,
-            approver=self.approver
-        )
-        self.document.validation_status = 'P'
-        self.document.save()
+        self._setup_pending_validation()
         
         self.client.force_authenticate(user=self.approver)
         
-        response = self.client.get('/api/documents/pending_approvals/')
+        with self.assertNumQueries(10):
+            response = self.client.get('/api/documents/pending_approvals/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]['id'], str(self.document.id))
+        
+        # Un segundo documento pendiente no debe añadir consultas (sin N+1)
+        document2 = Document.objects.create(
+            company=self.company,
+            entity=self.entity,
+            name="test2.pdf",
+            mime_type="application/pdf",
+            size_bytes=1024,
+            bucket_key="test/test2.pdf",
+            created_by=self.user
+        )
+        self._setup_pending_validation(document2)
+        
+        with self.assertNumQueries(10):
+            response = self.client.get('/api/documents/pending_approvals/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
     
     def test_get_approval_stats(self):
         """Prueba la obtención de estadísticas de aprobación."""
         # Crear flujo de validación y aprobar documento
-        validation_flow = ValidationFlow.objects.create(document=self.document)
-        ValidationStep.objects.create(
-            validation_flow=validation_flow,
-            order=1,
-            approver=self.approver
-        )
-        self.document.validation_status = 'P'
-        self.document.save()
+        _, step = self._setup_pending_validation()
         
         ValidationAction.objects.create(
             document=self.document,
-            validation_step=validation_flow.steps.first(),
+            validation_step=step,
             actor=self.approver,
             action='A',
             reason="Aprobado"
@@ -446,9 +429,8 @@ class DocumentAPITest(APITestCase):
     
     def test_list_documents(self):
         """Prueba la listación de documentos."""
-        self.client.force_authenticate(user=self.user)
-        
-        response = self.client.get('/api/documents/')
+        with self.assertNumQueries(7):
+            response = self.client.get('/api/documents/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
@@ -456,30 +438,25 @@ class DocumentAPITest(APITestCase):
     
     def test_retrieve_document(self):
         """Prueba la obtención de un documento específico."""
-        self.client.force_authenticate(user=self.user)
-        
-        response = self.client.get(f'/api/documents/{self.document.id}/')
+        with self.assertNumQueries(6):
+            response = self.client.get(f'/api/documents/{self.document.id}/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['id'], str(self.document.id))
         self.assertEqual(response.data['name'], 'test.pdf')
     
-    @patch('documents.services.storage_service')
-    def test_delete_document(self, mock_storage):
+    def test_delete_document(self):
         """Prueba la eliminación de un documento."""
-        self.client.force_authenticate(user=self.user)
-        
-        # Mock de eliminación exitosa
-        mock_storage.delete_file.return_value = True
-        
         response = self.client.delete(f'/api/documents/{self.document.id}/')
         
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Document.objects.filter(id=self.document.id).exists())
+        self.assertEqual(self.storage.deleted_keys, ['test/test.pdf'])
     
     def test_unauthorized_access(self):
         """Prueba el acceso no autorizado."""
         # Sin autenticación
+        self.client.force_authenticate(user=None)
         response = self.client.get('/api/documents/')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         
@@ -490,10 +467,9 @@ class DocumentAPITest(APITestCase):
             tax_id="900123456-2",
             email="otra@empresa.com"
         )
-        other_user = User.objects.create_user(
+        other_user = UserFactory(
             username="otheruser",
             email="other@test.com",
-            password="testpass123",
             company=other_company
         )
         
@@ -507,25 +483,37 @@ class DocumentAPITest(APITestCase):
 class CompanyAPITest(APITestCase):
     """Pruebas para la API de empresas."""
     
-    def setUp(self):
-        """Configuración inicial para las pruebas."""
-        self.company = Company.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Datos compartidos por las pruebas de la clase (se crean una vez)."""
+        cls.company = Company.objects.create(
             name="Empresa Test",
             legal_name="Empresa Test S.A.S.",
             tax_id="900123456-1",
             email="test@empresa.com"
         )
-        self.user = User.objects.create_user(
+        cls.user = UserFactory(
             username="testuser",
             email="test@test.com",
-            password="testpass123",
-            company=self.company
+            company=cls.company
+        )
+        cls.entity_type = EntityType.objects.create(
+            name="vehicle",
+            display_name="Vehículo"
         )
+        cls.entity = Entity.objects.create(
+            company=cls.company,
+            entity_type=cls.entity_type,
+            external_id="VEH001",
+            name="Vehículo Test"
+        )
+    
+    def setUp(self):
+        """Todas las pruebas de la clase actúan como el mismo usuario."""
+        self.client.force_authenticate(user=self.user)
     
     def test_list_companies(self):
         """Prueba la listación de empresas."""
-        self.client.force_authenticate(user=self.user)
-        
         response = self.client.get('/api/companies/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -534,8 +522,6 @@ class CompanyAPITest(APITestCase):
     
     def test_retrieve_company(self):
         """Prueba la obtención de una empresa específica."""
-        self.client.force_authenticate(user=self.user)
-        
         response = self.client.get(f'/api/companies/{self.company.id}/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -544,8 +530,6 @@ class CompanyAPITest(APITestCase):
     
     def test_company_stats(self):
         """Prueba la obtención de estadísticas de una empresa."""
-        self.client.force_authenticate(user=self.user)
-        
         response = self.client.get(f'/api/companies/{self.company.id}/stats/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -555,8 +539,6 @@ class CompanyAPITest(APITestCase):
     
     def test_company_users(self):
         """Prueba la obtención de usuarios de una empresa."""
-        self.client.force_authenticate(user=self.user)
-        
         response = self.client.get(f'/api/companies/{self.company.id}/users/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -565,21 +547,8 @@ class CompanyAPITest(APITestCase):
     
     def test_company_entities(self):
         """Prueba la obtención de entidades de una empresa."""
-        entity_type = EntityType.objects.create(
-            name="vehicle",
-            display_name="Vehículo"
-        )
-        entity = Entity.objects.create(
-            company=self.company,
-            entity_type=entity_type,
-            external_id="VEH001",
-            name="Vehículo Test"
-        )
-        
-        self.client.force_authenticate(user=self.user)
-        
         response = self.client.get(f'/api/companies/{self.company.id}/entities/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['id'], str(entity.id))
+        self.assertEqual(response.data[0]['id'], str(self.entity.id))